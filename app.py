@@ -1,23 +1,41 @@
 """Quick Wins — SEO Audit Tool. Streamlit UI."""
 
 import asyncio
+import functools
+import math
+import queue
+import re
 import sys
+import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
+from html import escape
+from pathlib import Path
 
-import nest_asyncio
 import streamlit as st
 
-# Allow async inside Streamlit's event loop
-nest_asyncio.apply()
-
 # Ensure project root is in path for imports
 sys.path.insert(0, ".")
 
-from core.crawler import crawl_site  # noqa: E402
+from core import crawl_cache  # noqa: E402
+from core.crawl_cache import crawl_site_cached  # noqa: E402
+from core.crawler import CONCURRENCY_RANGE, MAX_CONCURRENT, create_session  # noqa: E402
 from core.analyzer import analyze  # noqa: E402
-from core.llm_client import configure as configure_llm, prioritize_quickwins  # noqa: E402
-from core.excel_generator import create_action_plan  # noqa: E402
+from core.llm_client import (  # noqa: E402
+    configure as configure_llm,
+    prioritize_quickwins,
+    prompt_version,
+    warm_up as warm_up_llm,
+    MODEL_NAME,
+)
+from core import llm_cache as llm_store  # noqa: E402
+from core.llm_cache import cache_key, get_cached, stable_hash, store as store_cached  # noqa: E402
+from core import semantic_cache  # noqa: E402
+from utils.logger import get_logger  # noqa: E402
+
+log = get_logger("app")
 
 # ─── Page Config ────────────────────────────────────────────────
 
@@ -28,289 +46,465 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# ─── Event Loop ─────────────────────────────────────────────────
+
+POLL_INTERVAL = 0.1  # seconds between progress refreshes while waiting on the loop
+
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return a single event loop running in a daemon thread, shared across runs."""
+    try:
+        import uvloop  # optional, faster loop where available
+
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="quickwins-loop", daemon=True).start()
+    return loop
+
+
+def wait_for(future: Future, on_idle=None):
+    """Block on a future, calling on_idle from the script thread while it runs.
+
+    The shared loop thread never carries a Streamlit script context (it serves
+    every session), so anything that updates the page happens in on_idle.
+    """
+    while True:
+        try:
+            return future.result(timeout=POLL_INTERVAL)
+        except FutureTimeoutError:
+            if on_idle is not None:
+                on_idle()
+
+
+def run_async(coro, on_idle=None):
+    """Run a coroutine on the shared loop and block until it completes."""
+    return wait_for(asyncio.run_coroutine_threadsafe(coro, get_event_loop()), on_idle)
+
+
+@st.cache_resource
+def http_session():
+    """Return a keep-alive aiohttp session bound to the shared loop."""
+
+    async def _create():
+        return create_session()
+
+    return asyncio.run_coroutine_threadsafe(_create(), get_event_loop()).result()
+
+
+async def _crawl_and_warm_up(
+    url: str, progress_cb, session, concurrency: int, refresh: bool = False
+):
+    """Crawl the site while warming up the Gemini client in parallel."""
+    crawl_result, _ = await asyncio.gather(
+        crawl_site_cached(
+            url,
+            progress_cb=progress_cb,
+            session=session,
+            concurrency=concurrency,
+            refresh=refresh,
+        ),
+        warm_up_llm(),
+    )
+    return crawl_result
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _analyze_cached(crawl_hash: str, _crawl_result):
+    """Run the analyzer once per distinct crawl (keyed by its content hash)."""
+    return analyze(_crawl_result)
+
+
+@st.cache_resource
+def llm_cache() -> dict:
+    """Exact-match LLM result cache shared by every session in this process."""
+    return {}
+
+
+@st.cache_resource
+def similar_results_cache() -> list:
+    """Similarity LLM result cache shared by every session in this process."""
+    return []
+
+
 # ─── API Key ────────────────────────────────────────────────────
 
+
+@st.cache_resource
+def _api_key() -> str:
+    """Read the Gemini key from secrets once per process."""
+    return st.secrets["GOOGLE_API_KEY"]
+
+
+@st.cache_resource
+def _init_llm(api_key: str) -> bool:
+    """Configure Gemini once per process instead of on every rerun."""
+    configure_llm(api_key)
+    return True
+
+
 GEMINI_AVAILABLE = False
 try:
-    api_key = st.secrets["GOOGLE_API_KEY"]
-    configure_llm(api_key)
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = _init_llm(_api_key())
 except Exception:
     pass
 
 # ─── CSS ────────────────────────────────────────────────────────
 
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=JetBrains+Mono:wght@400;500&display=swap');
-
-/* ── Force readable text on ALL Streamlit elements ── */
-.stApp { background-color: #FFFFFF !important; font-family: 'Inter', -apple-system, sans-serif !important; }
-.stApp, .stApp p, .stApp div, .stApp span, .stApp li { color: #374151 !important; }
-.stApp h1, .stApp h2, .stApp h3, .stApp h4, .stApp h5, .stApp h6 {
-    font-family: 'Inter', -apple-system, sans-serif !important;
-    color: #1F2937 !important;
-    font-weight: 700 !important;
-}
-.stApp .stMarkdown p { color: #374151 !important; }
-.stApp .stMarkdown strong { color: #1F2937 !important; }
-
-/* Captions should be medium-gray, not invisible */
-.stApp .stCaption, .stApp [data-testid="stCaptionContainer"] p {
-    color: #6B7280 !important;
-}
+ASSETS_DIR = Path(__file__).parent / "assets"
 
-#MainMenu, footer, header { visibility: hidden; }
-.stDeployButton { display: none; }
 
-/* Hero */
-.hero { text-align: center; padding: 2.5rem 1.5rem .5rem; max-width: 640px; margin: 0 auto; }
-.hero-badge { display: inline-flex; align-items: center; gap: .5rem; padding: .35rem .9rem; border-radius: 20px; background: #EFF6FF; color: #2563EB !important; font-size: 12px; font-weight: 600; font-family: 'JetBrains Mono', monospace; letter-spacing: .03em; margin-bottom: 1rem; }
-.hero-badge-dot { width: 6px; height: 6px; border-radius: 50%; background: #2563EB; }
-.hero-title { font-size: 38px; font-weight: 800; color: #1F2937 !important; margin: 0 0 .4rem; letter-spacing: -.8px; line-height: 1.1; }
-.hero-sub { font-size: 15px; color: #6B7280 !important; margin: 0 0 1.75rem; line-height: 1.5; }
-.steps { display: grid; grid-template-columns: repeat(4, 1fr); gap: 0; margin-bottom: 1.75rem; max-width: 540px; margin-left: auto; margin-right: auto; position: relative; }
-.steps::before { content: ''; position: absolute; top: 15px; left: calc(12.5% + 15px); right: calc(12.5% + 15px); height: 2px; background: #E5E7EB; z-index: 0; }
-.step { text-align: center; position: relative; z-index: 1; }
-.step-num { display: inline-flex; align-items: center; justify-content: center; width: 30px; height: 30px; border-radius: 50%; background: #2563EB; color: white !important; font-weight: 700; font-size: 13px; font-family: 'JetBrains Mono', monospace; margin-bottom: .4rem; box-shadow: 0 2px 8px rgba(37,99,235,0.2); }
-.step-label { font-size: 12px; color: #6B7280 !important; line-height: 1.3; }
+@st.cache_resource
+def load_asset(name: str) -> str:
+    """Read a static asset (CSS/HTML) once per process."""
+    return (ASSETS_DIR / name).read_text(encoding="utf-8")
 
-/* Input */
-.stTextInput > div > div > input { background: #FFFFFF !important; border: 1.5px solid #D1D5DB !important; border-radius: 10px !important; padding: 12px 16px !important; font-size: 15px !important; color: #1F2937 !important; }
-.stTextInput > div > div > input:focus { border-color: #2563EB !important; box-shadow: 0 0 0 3px rgba(37,99,235,0.1) !important; }
-.stTextInput > div > div > input::placeholder { color: #9CA3AF !important; }
 
-/* Primary buttons */
-.stButton > button { background: #2563EB !important; color: #FFFFFF !important; border: none !important; border-radius: 10px !important; padding: .6rem 1.5rem !important; font-size: 14px !important; font-weight: 600 !important; }
-.stButton > button:hover { background: #1D4ED8 !important; }
-.stButton > button:disabled { background: #D1D5DB !important; color: #9CA3AF !important; }
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+WHITESPACE_RE = re.compile(r"\s+")
+FOOTER_HTML = '<div class="footer">Quick Wins &middot; SEO Audit Tool</div>'
 
-/* Progress bar */
-.stProgress > div > div > div > div { background: linear-gradient(90deg, #2563EB, #3B82F6) !important; border-radius: 10px; }
 
-/* Download button */
-.stDownloadButton > button { background: #FFFFFF !important; color: #1F2937 !important; border: 1.5px solid #D1D5DB !important; border-radius: 10px !important; }
-.stDownloadButton > button:hover { border-color: #2563EB !important; color: #2563EB !important; background: #EFF6FF !important; }
+@st.cache_resource
+def style_block() -> str:
+    """Return the stylesheet as a minified <style> block, built once per process."""
+    css = WHITESPACE_RE.sub(" ", CSS_COMMENT_RE.sub("", load_asset("styles.css"))).strip()
+    return f"<style>{css}</style>"
 
-/* Tabs */
-.stTabs [data-baseweb="tab"] { font-weight: 500 !important; font-size: 14px !important; color: #374151 !important; }
 
-.footer { text-align: center; padding: 3rem 0 1.5rem; font-size: 12px; color: #9CA3AF !important; }
-</style>
-""", unsafe_allow_html=True)
+# Streamlit drops any element not re-emitted on a rerun, so the style block
+# must be written every run; only building it is cached.
+st.markdown(style_block(), unsafe_allow_html=True)
 
 
 # ─── Rendering Helpers ──────────────────────────────────────────
 
+FINDING_CATEGORIES = (
+    ("content", "Content"),
+    ("headings", "Headings"),
+    ("links", "Links"),
+    ("technical", "Technical"),
+)
 IMPACT_LABELS = {"high": "High", "medium": "Medium", "low": "Low"}
 SEVERITY_LABELS = {"critical": "Critical", "high": "High", "medium": "Medium", "low": "Low"}
 
+SCORE_RADIUS = 58
+SCORE_CIRCUMFERENCE = math.tau * SCORE_RADIUS
+SCORE_COLORS = ((70, "#10B981"), (40, "#F59E0B"))  # (min score, color), else red
+
+
+SCORE_CIRCLE_TEMPLATE = (
+    '<div style="text-align:center;padding:2rem 0 .5rem">'
+    '<div style="position:relative;display:inline-block;width:140px;height:140px">'
+    '<svg width="140" height="140" viewBox="0 0 140 140" style="transform:rotate(-90deg)">'
+    '<circle cx="70" cy="70" r="{radius}" fill="none" stroke="#E5E7EB" stroke-width="8"/>'
+    '<circle cx="70" cy="70" r="{radius}" fill="none" stroke="{color}" stroke-width="8" '
+    'stroke-linecap="round" stroke-dasharray="{circumference:.3f}" stroke-dashoffset="{offset:.3f}"/>'
+    '</svg>'
+    '<div style="position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);'
+    "font-size:42px;font-weight:800;font-family:'JetBrains Mono',monospace;color:#1F2937\">{score}</div>"
+    '</div></div>'
+)
+
 
+@functools.lru_cache(maxsize=101)
 def render_score_circle(score: int) -> str:
-    """Render an SVG score circle."""
-    if score >= 70:
-        color = "#10B981"
-    elif score >= 40:
-        color = "#F59E0B"
-    else:
-        color = "#EF4444"
-    radius = 58
-    circumference = 2 * 3.14159 * radius
-    offset = circumference * (1 - score / 100)
-    return f"""<div style="text-align:center;padding:2rem 0 .5rem">
-        <div style="position:relative;display:inline-block;width:140px;height:140px">
-            <svg width="140" height="140" viewBox="0 0 140 140" style="transform:rotate(-90deg)">
-                <circle cx="70" cy="70" r="{radius}" fill="none" stroke="#E5E7EB" stroke-width="8"/>
-                <circle cx="70" cy="70" r="{radius}" fill="none" stroke="{color}" stroke-width="8"
-                    stroke-linecap="round" stroke-dasharray="{circumference}" stroke-dashoffset="{offset}"/>
-            </svg>
-            <div style="position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);font-size:42px;font-weight:800;font-family:'JetBrains Mono',monospace;color:#1F2937">{score}</div>
-        </div></div>"""
-
-
-def render_quickwin_card(win: dict, rank: int) -> None:
-    """Render a quick win card using native Streamlit components."""
-    impact = (win.get("impact") or "medium").lower()
-    effort = (win.get("effort") or "medium").lower()
-    urls_count = win.get("urls_affected", 0)
-    category = (win.get("category") or "general").title()
-    why = win.get("why_matters", "")
-    action = win.get("what_to_do", "")
-    example_urls = win.get("example_urls", [])
-
-    with st.container(border=True):
-        col_rank, col_content = st.columns([1, 20])
-        with col_rank:
-            st.markdown(f"### {rank}")
-        with col_content:
-            st.markdown(f"**{win.get('issue', '')}**")
-            if why:
-                st.write(why)
-            if action:
-                st.info(f"**What to do:** {action}")
-
-            c1, c2, c3, c4 = st.columns(4)
-            c1.write(f"**{category}**")
-            c2.write(f"**{urls_count}** URLs")
-            c3.write(f"Impact: **{IMPACT_LABELS.get(impact, impact)}**")
-            c4.write(f"Effort: **{IMPACT_LABELS.get(effort, effort)}**")
-
-        if example_urls:
-            with st.expander(f"View {len(example_urls)} affected URLs"):
-                for eu in example_urls[:10]:
-                    st.code(eu, language=None)
-
-
-def render_finding_item(finding: dict) -> None:
-    """Render a single finding using native Streamlit components."""
-    severity = (finding.get("severity") or "medium").lower()
-    count = finding.get("count", 0)
-    sev_label = SEVERITY_LABELS.get(severity, severity)
-    urls = finding.get("urls", [])
-
-    with st.container(border=True):
-        col_text, col_sev, col_count = st.columns([8, 2, 2])
-        with col_text:
-            st.write(f"**{finding.get('issue', '')}**")
-        with col_sev:
-            st.write(f"*{sev_label}*")
-        with col_count:
-            st.write(f"**{count}** URLs")
-
-        if urls:
-            with st.expander(f"View {len(urls)} affected URLs"):
-                for u in urls[:20]:
-                    st.code(u, language=None)
+    """Render an SVG score circle (scores are 0-100, so the cache holds every variant)."""
+    color = next((c for threshold, c in SCORE_COLORS if score >= threshold), "#EF4444")
+    return SCORE_CIRCLE_TEMPLATE.format(
+        radius=SCORE_RADIUS,
+        color=color,
+        circumference=SCORE_CIRCUMFERENCE,
+        offset=SCORE_CIRCUMFERENCE * (1 - score / 100),
+        score=score,
+    )
 
 
-# ─── Session State ──────────────────────────────────────────────
+SCORE_HEADER_TEMPLATE = (
+    '<p style="text-align:center;color:#374151;font-size:14px;margin:0">'
+    'SEO Health Score for <strong style="color:#1F2937">{domain}</strong></p>'
+    '<p style="text-align:center;color:#6B7280;font-size:12px;font-family:monospace;margin:.25rem 0 0">'
+    '{urls_analyzed} pages analyzed &middot; {date}</p>'
+)
 
-if "result" not in st.session_state:
-    st.session_state.result = None
-if "crawl_data" not in st.session_state:
-    st.session_state.crawl_data = None
-if "analysis_data" not in st.session_state:
-    st.session_state.analysis_data = None
 
+@functools.lru_cache(maxsize=64)
+def render_score_header(domain: str, urls_analyzed: int, date: str) -> str:
+    """Render the domain / pages / date line under the score circle."""
+    return SCORE_HEADER_TEMPLATE.format(
+        domain=escape(domain), urls_analyzed=urls_analyzed, date=date
+    )
 
-# ─── Hero Section ───────────────────────────────────────────────
 
-st.markdown("""
-<div class="hero">
-    <div class="hero-badge"><span class="hero-badge-dot"></span> SEO AUDIT TOOL</div>
-    <h1 class="hero-title">Quick Wins</h1>
-    <p class="hero-sub">Find actionable SEO improvements you can fix today.</p>
-    <div class="steps">
-        <div class="step"><div class="step-num">1</div><div class="step-label">Enter URL</div></div>
-        <div class="step"><div class="step-num">2</div><div class="step-label">Analyze</div></div>
-        <div class="step"><div class="step-num">3</div><div class="step-label">Review wins</div></div>
-        <div class="step"><div class="step-num">4</div><div class="step-label">Download</div></div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+def render_url_list(urls: list) -> str:
+    """Render URLs as one monospace HTML list instead of one st.code per URL."""
+    items = "".join(f"<code>{escape(u)}</code>" for u in urls)
+    return f'<div class="url-list">{items}</div>'
+
+
+QUICKWIN_CARD_TEMPLATE = (
+    '<div class="qw-card">'
+    '<div class="qw-rank">{rank}</div>'
+    '<div class="qw-body">'
+    '<div class="qw-issue">{issue}</div>'
+    '{why}{action}'
+    '<div class="qw-stats">'
+    '<span><strong>{category}</strong></span>'
+    '<span><strong>{urls_count}</strong> URLs</span>'
+    '<span>Impact: <strong>{impact}</strong></span>'
+    '<span>Effort: <strong>{effort}</strong></span>'
+    '</div>{url_list}</div></div>'
+)
 
 
-# ─── Input ──────────────────────────────────────────────────────
+def render_url_details(urls: tuple, total: int) -> str:
+    """Render a collapsible URL list; empty when there are no URLs."""
+    if not urls:
+        return ""
+    return f'<details><summary>View {total} affected URLs</summary>{render_url_list(urls)}</details>'
+
+
+@functools.lru_cache(maxsize=512)
+def _quickwin_card_html(
+    rank: int,
+    issue: str,
+    why: str,
+    action: str,
+    category: str,
+    urls_affected: int,
+    impact_label: str,
+    effort_label: str,
+    example_urls: tuple,
+    total_urls: int,
+) -> str:
+    return QUICKWIN_CARD_TEMPLATE.format(
+        rank=rank,
+        issue=escape(issue),
+        why=f'<p class="qw-why">{escape(why)}</p>' if why else "",
+        action=f'<div class="qw-action"><strong>What to do:</strong> {escape(action)}</div>' if action else "",
+        category=escape(category.title()),
+        urls_count=urls_affected,
+        impact=escape(impact_label),
+        effort=escape(effort_label),
+        url_list=render_url_details(example_urls, total_urls),
+    )
 
-col_input, col_btn = st.columns([4, 1])
-with col_input:
-    url_input = st.text_input(
-        "URL",
-        placeholder="https://example.com",
-        label_visibility="collapsed",
+
+def render_quickwin_card(win: dict, rank: int) -> str:
+    """Render a quick win card, including its collapsible URL list, as HTML."""
+    return _quickwin_card_html(
+        rank,
+        win["issue"],
+        win["why_matters"],
+        win["what_to_do"],
+        win["category"],
+        win["urls_affected"],
+        win["impact_label"],
+        win["effort_label"],
+        win["display_urls"],
+        win["example_urls_total"],
     )
-with col_btn:
-    run_btn = st.button(
-        "Analyze Site",
-        disabled=not url_input or not GEMINI_AVAILABLE,
-        use_container_width=True,
+
+
+def render_quickwins_block(top_5: list) -> None:
+    """Render all quick win cards with a single markdown call."""
+    st.markdown(
+        "".join(render_quickwin_card(win, i) for i, win in enumerate(top_5, 1)),
+        unsafe_allow_html=True,
     )
 
-if not GEMINI_AVAILABLE:
-    st.error("Gemini API key not configured. Add `GOOGLE_API_KEY` to Streamlit secrets.")
 
+@functools.lru_cache(maxsize=512)
+def _finding_html(issue: str, severity_label: str, count: int, urls: tuple, total_urls: int) -> str:
+    return (
+        f'<div class="finding">'
+        f'<div class="finding-row">'
+        f'<span class="finding-issue">{escape(issue)}</span>'
+        f'<span class="finding-sev">{escape(severity_label)}</span>'
+        f'<span class="finding-count"><strong>{count}</strong> URLs</span>'
+        f'</div>{render_url_details(urls, total_urls)}</div>'
+    )
 
-# ─── Run Analysis ───────────────────────────────────────────────
 
-if run_btn and url_input:
-    st.session_state.result = None
-    st.session_state.crawl_data = None
-    st.session_state.analysis_data = None
+def render_finding_item(finding: dict) -> str:
+    """Render a single finding as an HTML card with a collapsible URL list."""
+    return _finding_html(
+        finding["issue"],
+        finding["severity_label"],
+        finding["count"],
+        finding["display_urls"],
+        finding["urls_total"],
+    )
 
-    progress = st.progress(0)
-    status_text = st.empty()
 
-    def update_progress(pct: int, msg: str) -> None:
-        progress.progress(min(pct, 100))
-        status_text.caption(msg)
+def render_findings_block(findings: list) -> None:
+    """Render a list of findings with a single markdown call."""
+    st.markdown("".join(render_finding_item(f) for f in findings), unsafe_allow_html=True)
 
-    try:
-        # Crawl
-        update_progress(5, "Discovering pages from sitemaps...")
-        loop = asyncio.new_event_loop()
-        crawl_result = loop.run_until_complete(
-            crawl_site(url_input, progress_cb=update_progress)
-        )
-        loop.close()
-        st.session_state.crawl_data = crawl_result
 
-        # Analyze
-        update_progress(80, "Detecting SEO issues...")
-        analysis = analyze(crawl_result)
-        st.session_state.analysis_data = analysis
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _excel_future(result_hash: str, _top_5: list, _all_findings: dict, domain: str) -> Future:
+    """Start building the Excel action plan on a worker thread, once per result set."""
+    # Imported lazily so openpyxl only loads once results exist
+    from core.excel_generator import action_plan_bytes
 
-        # LLM Prioritization
-        update_progress(85, "AI is picking your Top 5 Quick Wins...")
-        llm_result = prioritize_quickwins(
-            analysis.to_dict(),
-            crawl_result.to_dict(),
-        )
-        if llm_result:
-            st.session_state.result = llm_result
+    return asyncio.run_coroutine_threadsafe(
+        asyncio.to_thread(action_plan_bytes, _top_5, _all_findings, domain),
+        get_event_loop(),
+    )
 
-        update_progress(100, "Done!")
 
-    except Exception as e:
-        st.error(f"Analysis failed: {str(e)}")
+def excel_bytes(future: Future | None, top_5: list, all_findings: dict, domain: str) -> bytes:
+    """Workbook bytes from the background build, or built in-process if it failed."""
+    if future is not None:
+        try:
+            return future.result()
+        except Exception as e:
+            log.warning(f"Background Excel build failed, building in-process: {e!r}")
+            # A cached failed Future would re-raise on every render of this result
+            _excel_future.clear()
+
+    from core.excel_generator import action_plan_bytes
+
+    return action_plan_bytes(top_5, all_findings, domain)
+
+
+def findings_from_analysis(analysis) -> dict:
+    """Build the all_findings dict from raw analyzer output (before the LLM runs)."""
+    if not analysis:
+        return {}
+    groups = {
+        "content": analysis.content_issues,
+        "headings": analysis.heading_issues,
+        "links": analysis.link_issues,
+        "technical": analysis.technical_issues,
+    }
+    return {
+        category: [
+            _prepare_finding({
+                "issue": issue.title,
+                "type": issue.issue_type,
+                "severity": issue.severity,
+                "count": issue.count,
+                "urls": issue.affected_urls,
+            })
+            for issue in issues
+        ]
+        for category, issues in groups.items()
+    }
+
+
+WIN_DEFAULTS = {
+    "issue": "",
+    "category": "general",
+    "urls_affected": 0,
+    "why_matters": "",
+    "what_to_do": "",
+    "impact": "medium",
+    "effort": "medium",
+    "example_urls": [],
+}
+FINDING_DEFAULTS = {"issue": "", "severity": "medium", "count": 0, "urls": []}
 
-    time.sleep(0.3)
-    progress.empty()
-    status_text.empty()
+# Cards show at most this many URLs; the Excel sheets get the full lists
+QUICKWIN_URL_LIMIT = 10
+FINDING_URL_LIMIT = 20
 
 
-# ─── Results ────────────────────────────────────────────────────
+def _normalize(d: dict, defaults: dict) -> dict:
+    """Fill missing or None fields from defaults so renderers can index directly."""
+    return {**defaults, **{k: v for k, v in d.items() if v is not None}}
 
-if st.session_state.result:
-    data = st.session_state.result
-    crawl = st.session_state.crawl_data
-    analysis = st.session_state.analysis_data
 
+def _as_int(value) -> int:
+    """Coerce an LLM-supplied count to int; anything non-numeric becomes 0."""
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _prepare_finding(finding: dict) -> dict:
+    """Normalize a finding and attach its severity label and displayed URLs."""
+    finding = _normalize(finding, FINDING_DEFAULTS)
+    severity = finding["severity"].lower()
+    urls = finding["urls"]
+    return {
+        **finding,
+        "severity": severity,
+        "severity_label": SEVERITY_LABELS.get(severity, severity),
+        "count": _as_int(finding["count"]),
+        "display_urls": tuple(urls[:FINDING_URL_LIMIT]),
+        "urls_total": len(urls),
+    }
+
+
+def _prepare_win(win: dict) -> dict:
+    """Normalize a quick win and attach its impact/effort labels and displayed URLs."""
+    win = _normalize(win, WIN_DEFAULTS)
+    impact = win["impact"].lower()
+    effort = win["effort"].lower()
+    example_urls = win["example_urls"]
+    return {
+        **win,
+        "impact": impact,
+        "effort": effort,
+        "urls_affected": _as_int(win["urls_affected"]),
+        "impact_label": IMPACT_LABELS.get(impact, impact),
+        "effort_label": IMPACT_LABELS.get(effort, effort),
+        "display_urls": tuple(example_urls[:QUICKWIN_URL_LIMIT]),
+        "example_urls_total": len(example_urls),
+    }
+
+
+def prepare_result(result: dict) -> dict:
+    """Precompute display labels once per audit so rendering is plain lookups."""
+    return {
+        **result,
+        "top_5_quick_wins": [_prepare_win(w) for w in result.get("top_5_quick_wins", [])],
+        "all_findings": {
+            category: [_prepare_finding(f) for f in findings]
+            for category, findings in (result.get("all_findings") or {}).items()
+        },
+    }
+
+
+def render_results(result: dict | None, crawl, analysis, final: bool = True) -> None:
+    """Render the results section; any of result/crawl/analysis may still be None."""
+    data = result or {}
     top_5 = data.get("top_5_quick_wins", [])
-    all_findings = data.get("all_findings", {})
+    all_findings = data.get("all_findings") or findings_from_analysis(analysis)
     score = data.get("score", analysis.score if analysis else 0)
     domain = data.get("domain", crawl.domain if crawl else "")
     urls_analyzed = crawl.urls_analyzed if crawl else 0
 
+    # Kick off the workbook build now so it overlaps with rendering below
+    excel_future = None
+    if final:
+        excel_future = _excel_future(
+            stable_hash([top_5, all_findings, domain]), top_5, all_findings, domain
+        )
+
     st.divider()
 
     # ── Reset Button ──
-    _, col_reset = st.columns([5, 1])
-    with col_reset:
-        if st.button("New Analysis", type="secondary", use_container_width=True):
-            st.session_state.result = None
-            st.session_state.crawl_data = None
-            st.session_state.analysis_data = None
-            st.rerun()
+    if final:
+        _, col_reset = st.columns([5, 1])
+        with col_reset:
+            if st.button("New Analysis", type="secondary", use_container_width=True):
+                reset_audit()
+                st.rerun()
 
     # ── Score ──
-    st.markdown(render_score_circle(score), unsafe_allow_html=True)
-    st.markdown(
-        f'<p style="text-align:center;color:#374151;font-size:14px;margin:0">'
-        f'SEO Health Score for <strong style="color:#1F2937">{domain}</strong></p>'
-        f'<p style="text-align:center;color:#6B7280;font-size:12px;font-family:monospace;margin:.25rem 0 0">'
-        f'{urls_analyzed} pages analyzed &middot; {datetime.now().strftime("%b %d, %Y")}</p>',
-        unsafe_allow_html=True,
-    )
+    if analysis or result:
+        st.markdown(render_score_circle(score), unsafe_allow_html=True)
+        st.markdown(
+            render_score_header(domain, urls_analyzed, f"{st.session_state.audit_ts:%b %d, %Y}"),
+            unsafe_allow_html=True,
+        )
+    else:
+        st.caption(f"{urls_analyzed} pages crawled on {domain}. Detecting SEO issues...")
 
     # ── Sitemap Warning ──
     if crawl and crawl.sitemap_missing:
@@ -329,52 +523,45 @@ if st.session_state.result:
         )
 
     # ── Top 5 Quick Wins ──
+    if not final and analysis:
+        st.info("AI is picking your Top 5 Quick Wins...")
     if top_5:
         st.subheader(f"Your Top {len(top_5)} Quick Wins")
-        for i, win in enumerate(top_5, 1):
-            render_quickwin_card(win, i)
-
-    # ── All Findings (Tabs) ──
-    content_findings = all_findings.get("content", [])
-    heading_findings = all_findings.get("headings", [])
-    link_findings = all_findings.get("links", [])
-    tech_findings = all_findings.get("technical", [])
+        render_quickwins_block(top_5)
 
-    total_findings = len(content_findings) + len(heading_findings) + len(link_findings) + len(tech_findings)
+    # ── All Findings ──
+    categories = [
+        (f"{label} ({len(findings)})", findings)
+        for key, label in FINDING_CATEGORIES
+        if (findings := all_findings.get(key))
+    ]
 
-    if total_findings > 0:
+    if categories:
         st.divider()
-        st.subheader(f"All Findings ({total_findings})")
-
-        tab_labels = []
-        tab_data = []
-        if content_findings:
-            tab_labels.append(f"Content ({len(content_findings)})")
-            tab_data.append(content_findings)
-        if heading_findings:
-            tab_labels.append(f"Headings ({len(heading_findings)})")
-            tab_data.append(heading_findings)
-        if link_findings:
-            tab_labels.append(f"Links ({len(link_findings)})")
-            tab_data.append(link_findings)
-        if tech_findings:
-            tab_labels.append(f"Technical ({len(tech_findings)})")
-            tab_data.append(tech_findings)
-
-        if tab_labels:
-            tabs = st.tabs(tab_labels)
-            for tab, findings in zip(tabs, tab_data):
-                with tab:
-                    for f in findings:
-                        render_finding_item(f)
+        st.subheader(f"All Findings ({sum(len(f) for _, f in categories)})")
+
+        # Only the selected category is rendered, unlike st.tabs which
+        # sends every tab's content to the browser up front.
+        labels = [label for label, _ in categories]
+        selected = st.selectbox(
+            "Category",
+            labels,
+            index=0,
+            label_visibility="collapsed",
+            key="findings_category" if final else "findings_category_partial",
+        )
+        render_findings_block(categories[labels.index(selected)][1])
 
     # ── Download ──
+    if not final:
+        return
+
     st.divider()
     st.subheader("Download Action Plan")
     st.write("Get the full report as an Excel file ready for Google Sheets.")
 
-    excel = create_action_plan(top_5, all_findings, domain)
-    fname = f"QuickWins_{domain}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+    excel = excel_bytes(excel_future, top_5, all_findings, domain)
+    fname = f"QuickWins_{domain}_{st.session_state.audit_ts:%Y%m%d}.xlsx"
     st.download_button(
         label="Download Action Plan (.xlsx)",
         data=excel,
@@ -384,6 +571,209 @@ if st.session_state.result:
     )
 
 
+# ─── Session State ──────────────────────────────────────────────
+
+AUDIT_STATE_KEYS = ("result", "crawl_data", "analysis_data", "audit_ts")
+
+
+def reset_audit() -> None:
+    """Drop the current audit from session state."""
+    for key in AUDIT_STATE_KEYS:
+        st.session_state[key] = None
+
+
+def clear_audit_caches() -> None:
+    """Invalidate every cached crawl, analysis, LLM result and workbook."""
+    _analyze_cached.clear()
+    _excel_future.clear()
+    llm_cache().clear()
+    llm_store.clear()
+    similar_results_cache().clear()
+    crawl_cache.clear()
+
+
+for key in AUDIT_STATE_KEYS:
+    st.session_state.setdefault(key, None)
+
+
+# ─── Hero Section ───────────────────────────────────────────────
+
+st.markdown(load_asset("hero.html"), unsafe_allow_html=True)
+
+
+# ─── Input ──────────────────────────────────────────────────────
+
+col_input, col_btn = st.columns([4, 1])
+with col_input:
+    url_input = st.text_input(
+        "URL",
+        placeholder="https://example.com",
+        label_visibility="collapsed",
+    )
+with col_btn:
+    run_btn = st.button(
+        "Analyze Site",
+        disabled=not url_input or not GEMINI_AVAILABLE,
+        use_container_width=True,
+    )
+
+concurrency = st.sidebar.slider(
+    "Crawl concurrency",
+    min_value=CONCURRENCY_RANGE[0],
+    max_value=CONCURRENCY_RANGE[1],
+    value=MAX_CONCURRENT,
+    help="Maximum simultaneous requests to the audited site.",
+)
+force_recrawl = st.sidebar.checkbox(
+    "Force re-crawl",
+    help="Ignore the cached crawl for this site (kept for 24h) and fetch it again.",
+)
+if st.sidebar.button("Clear cached audits", use_container_width=True):
+    clear_audit_caches()
+    reset_audit()
+    st.rerun()
+
+if not GEMINI_AVAILABLE:
+    st.error("Gemini API key not configured. Add `GOOGLE_API_KEY` to Streamlit secrets.")
+
+
+# ─── Run Analysis ───────────────────────────────────────────────
+
+if run_btn and url_input:
+    reset_audit()
+
+    progress = st.progress(0)
+    status_box = st.empty()
+    status = status_box.status("Starting audit...", expanded=False)
+    partial = st.empty()
+
+    def update_progress(pct: int, msg: str) -> None:
+        progress.progress(min(pct, 100))
+        status.update(label=msg)
+
+    # The crawler reports once per page from the loop thread; it only queues
+    # events, and the script thread shows the latest one each poll
+    crawl_events = queue.SimpleQueue()
+
+    def show_crawl_progress() -> None:
+        latest = None
+        while not crawl_events.empty():
+            latest = crawl_events.get_nowait()
+        if latest is not None:
+            update_progress(*latest)
+
+    try:
+        # Crawl
+        update_progress(5, "Discovering pages from sitemaps...")
+        crawl_result = run_async(
+            _crawl_and_warm_up(
+                url_input,
+                lambda pct, msg: crawl_events.put((pct, msg)),
+                http_session(),
+                concurrency,
+                force_recrawl,
+            ),
+            on_idle=show_crawl_progress,
+        )
+        show_crawl_progress()
+        st.session_state.crawl_data = crawl_result
+        status.write(
+            f"Crawled {crawl_result.urls_analyzed} of {crawl_result.urls_discovered} "
+            f"discovered pages via {crawl_result.discovery_method}"
+        )
+        with partial.container():
+            render_results(None, crawl_result, None, final=False)
+
+        # Analyze
+        update_progress(80, "Detecting SEO issues...")
+        analysis = _analyze_cached(stable_hash(crawl_result), crawl_result)
+        st.session_state.analysis_data = analysis
+        # Fixed once per audit so the header date and download filename
+        # stay stable across reruns
+        st.session_state.audit_ts = datetime.now()
+        status.write(f"Detected {analysis.total_count} issues (score {analysis.score}/100)")
+
+        # LLM Prioritization — start the Gemini call before rendering the
+        # partial findings so the two overlap
+        update_progress(85, "AI is picking your Top 5 Quick Wins...")
+        analysis_dict = analysis.to_dict()
+        crawl_dict = crawl_result.to_dict()
+        key = cache_key(analysis_dict, crawl_dict, MODEL_NAME, prompt_version())
+        findings_vec = semantic_cache.findings_vector(analysis_dict)
+        llm_result = get_cached(llm_cache(), key)
+        if llm_result is None:
+            llm_result = llm_store.load(key)
+            if llm_result is not None:
+                store_cached(llm_cache(), key, llm_result)
+        if llm_result is None:
+            similar = semantic_cache.lookup(
+                similar_results_cache(), crawl_result.domain, findings_vec
+            )
+            if similar is not None:
+                llm_result = semantic_cache.rebase(similar, analysis_dict, crawl_result.domain)
+        llm_future = None
+        llm_chars = [0]  # written by the worker thread, read by the poll below
+        if llm_result is None:
+            def _llm_received(n: int) -> None:
+                llm_chars[0] = n
+
+            llm_future = asyncio.run_coroutine_threadsafe(
+                asyncio.to_thread(
+                    prioritize_quickwins, analysis_dict, crawl_dict, on_chunk=_llm_received
+                ),
+                get_event_loop(),
+            )
+
+        with partial.container():
+            render_results(None, crawl_result, analysis, final=False)
+
+        if llm_future is not None:
+            def show_llm_progress() -> None:
+                if llm_chars[0]:
+                    status.update(
+                        label=f"AI is picking your Top 5 Quick Wins... "
+                        f"({llm_chars[0]:,} chars received)"
+                    )
+
+            llm_result = wait_for(llm_future, on_idle=show_llm_progress)
+            if llm_result:
+                store_cached(llm_cache(), key, llm_result)
+                llm_store.save(key, llm_result)
+                semantic_cache.add(
+                    similar_results_cache(), crawl_result.domain, findings_vec, llm_result
+                )
+        if llm_result:
+            st.session_state.result = prepare_result(llm_result)
+
+        update_progress(100, "Done!")
+
+    except Exception as e:
+        status.update(label="Analysis failed", state="error")
+        st.error(f"Analysis failed: {str(e)}")
+
+    time.sleep(0.3)
+    progress.empty()
+    status_box.empty()
+    partial.empty()
+
+
+# ─── Results ────────────────────────────────────────────────────
+
+
+@st.fragment
+def results_fragment() -> None:
+    """Results section; its widgets rerun only this fragment, not the whole page."""
+    render_results(
+        st.session_state.result,
+        st.session_state.crawl_data,
+        st.session_state.analysis_data,
+    )
+
+
+if st.session_state.result or st.session_state.analysis_data:
+    results_fragment()
+
+
 # ─── Footer ─────────────────────────────────────────────────────
 
-st.markdown('<div class="footer">Quick Wins &middot; SEO Audit Tool</div>', unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
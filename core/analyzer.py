@@ -67,6 +67,39 @@ class AnalysisResult:
         }
 
 
+# ─── Per-Page Accessors ─────────────────────────────────────────
+
+
+def _page_url(p) -> str:
+    """Return the final URL of a page (PageSignals or dict), falling back to the requested URL."""
+    if hasattr(p, "final_url"):
+        return p.final_url or p.url
+    return p.get("final_url") or p.get("url", "")
+
+
+def _is_live(p) -> bool:
+    """True if the page was fetched without error and returned a non-error status."""
+    status = p.status if hasattr(p, "status") else p.get("status")
+    error = p.error if hasattr(p, "error") else p.get("error", "")
+    return bool(not error and status and status < 400)
+
+
+def _collapse_similar(entries: list[tuple]) -> list[dict]:
+    """Keep the first page per distinct (key, detail) pattern and count the rest.
+
+    Templated pages repeat the same headings; sending each copy to the LLM
+    burns tokens without adding information.
+    """
+    groups: dict = {}
+    for key, detail in entries:
+        rep = groups.get(key)
+        if rep is None:
+            groups[key] = detail
+        else:
+            rep["similar_pages"] = rep.get("similar_pages", 0) + 1
+    return list(groups.values())
+
+
 # ─── Score Calculation ──────────────────────────────────────────
 
 SEVERITY_WEIGHTS = {"critical": 15, "high": 8, "medium": 4, "low": 1}
@@ -93,8 +126,8 @@ def _detect_duplicate_titles(pages: list) -> list[Issue]:
     titles = defaultdict(list)
     for p in pages:
         title = (p.title if hasattr(p, "title") else p.get("title", "")).strip()
-        if title:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if title and _is_live(p):
+            url = _page_url(p)
             titles[title].append(url)
 
     duplicates = {t: urls for t, urls in titles.items() if len(urls) > 1}
@@ -127,10 +160,8 @@ def _detect_missing_titles(pages: list) -> list[Issue]:
     affected = []
     for p in pages:
         title = (p.title if hasattr(p, "title") else p.get("title", "")).strip()
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if not title and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if not title and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
 
     if not affected:
@@ -154,8 +185,8 @@ def _detect_duplicate_metas(pages: list) -> list[Issue]:
     metas = defaultdict(list)
     for p in pages:
         meta = (p.meta_description if hasattr(p, "meta_description") else p.get("meta_description", "")).strip()
-        if meta:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if meta and _is_live(p):
+            url = _page_url(p)
             metas[meta].append(url)
 
     duplicates = {m: urls for m, urls in metas.items() if len(urls) > 1}
@@ -188,10 +219,8 @@ def _detect_missing_metas(pages: list) -> list[Issue]:
     affected = []
     for p in pages:
         meta = (p.meta_description if hasattr(p, "meta_description") else p.get("meta_description", "")).strip()
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if not meta and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if not meta and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
 
     if not affected:
@@ -216,10 +245,8 @@ def _detect_thin_content(pages: list) -> list[Issue]:
     details = []
     for p in pages:
         wc = p.word_count if hasattr(p, "word_count") else p.get("word_count", 0)
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if 0 < wc < 300 and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if 0 < wc < 300 and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
             details.append({"url": url, "word_count": wc})
 
@@ -249,10 +276,8 @@ def _detect_missing_h1(pages: list) -> list[Issue]:
     affected = []
     for p in pages:
         h1_count = len(p.h1s) if hasattr(p, "h1s") else p.get("h1_count", 0)
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if h1_count == 0 and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if h1_count == 0 and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
 
     if not affected:
@@ -278,12 +303,11 @@ def _detect_multiple_h1(pages: list) -> list[Issue]:
     for p in pages:
         h1s = p.h1s if hasattr(p, "h1s") else []
         h1_count = len(h1s) if h1s else (p.get("h1_count", 0) if isinstance(p, dict) else 0)
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if h1_count > 1 and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if h1_count > 1 and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
-            details.append({"url": url, "h1s": h1s[:5] if h1s else [], "count": h1_count})
+            examples = h1s[:5] if h1s else []
+            details.append((tuple(examples), {"url": url, "h1s": examples, "count": h1_count}))
 
     if not affected:
         return []
@@ -298,7 +322,7 @@ def _detect_multiple_h1(pages: list) -> list[Issue]:
         ),
         severity="low",
         affected_urls=affected,
-        details={"pages": details[:20]},
+        details={"pages": _collapse_similar(details)[:20]},
     )]
 
 
@@ -308,9 +332,7 @@ def _detect_broken_hierarchy(pages: list) -> list[Issue]:
     details = []
     for p in pages:
         headings = p.headings if hasattr(p, "headings") else p.get("headings", [])
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if not headings or error or not status or status >= 400:
+        if not headings or not _is_live(p):
             continue
 
         # Check for level skips (e.g., H1 → H3 without H2)
@@ -323,12 +345,10 @@ def _detect_broken_hierarchy(pages: list) -> list[Issue]:
             prev_level = level
 
         if broken:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+            url = _page_url(p)
             affected.append(url)
-            details.append({
-                "url": url,
-                "headings": [(lvl, txt) for lvl, txt in headings[:10]],
-            })
+            outline = [(lvl, txt) for lvl, txt in headings[:10]]
+            details.append((tuple(outline), {"url": url, "headings": outline}))
 
     if not affected:
         return []
@@ -344,7 +364,7 @@ def _detect_broken_hierarchy(pages: list) -> list[Issue]:
         ),
         severity="low",
         affected_urls=affected,
-        details={"pages": details[:20]},
+        details={"pages": _collapse_similar(details)[:20]},
     )]
 
 
@@ -395,19 +415,22 @@ def _detect_redirect_chains(redirect_chains: list) -> list[Issue]:
 def _detect_orphan_pages(pages: list, all_discovered_urls: list) -> list[Issue]:
     """Detect pages that aren't linked to from any other crawled page."""
     # Collect all internal links from all pages
+    live = [p for p in pages if _is_live(p)]
     linked_to = set()
-    for p in pages:
+    for p in live:
         links = p.internal_links if hasattr(p, "internal_links") else p.get("internal_links", [])
         for link in links:
             linked_to.add(normalize_url(link))
 
+    # Skip homepage — it's typically linked to from external sources
+    homepage = normalize_url(all_discovered_urls[0]) if all_discovered_urls else None
+
     # Find pages that no one links to (except homepage)
     affected = []
-    for p in pages:
-        url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+    for p in live:
+        url = _page_url(p)
         norm = normalize_url(url)
-        # Skip homepage — it's typically linked to from external sources
-        if norm == normalize_url(all_discovered_urls[0]) if all_discovered_urls else False:
+        if norm == homepage:
             continue
         if norm not in linked_to:
             affected.append(url)
@@ -437,10 +460,8 @@ def _detect_missing_canonical(pages: list) -> list[Issue]:
     affected = []
     for p in pages:
         canonical = (p.canonical if hasattr(p, "canonical") else p.get("canonical", "")).strip()
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if not canonical and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if not canonical and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
 
     if not affected:
@@ -465,14 +486,12 @@ def _detect_incorrect_canonical(pages: list, base_domain: str) -> list[Issue]:
     details = []
     for p in pages:
         canonical = (p.canonical if hasattr(p, "canonical") else p.get("canonical", "")).strip()
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if not canonical or error or not status or status >= 400:
+        if not canonical or not _is_live(p):
             continue
 
         canon_domain = normalize_domain(canonical)
         if canon_domain and canon_domain != base_domain:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+            url = _page_url(p)
             affected.append(url)
             details.append({"url": url, "canonical": canonical, "canonical_domain": canon_domain})
 
@@ -499,10 +518,8 @@ def _detect_noindex_issues(pages: list) -> list[Issue]:
     affected = []
     for p in pages:
         robots = (p.robots_meta if hasattr(p, "robots_meta") else p.get("robots_meta", "")).lower()
-        status = p.status if hasattr(p, "status") else p.get("status")
-        error = p.error if hasattr(p, "error") else p.get("error", "")
-        if "noindex" in robots and not error and status and status < 400:
-            url = p.final_url or p.url if hasattr(p, "final_url") else p.get("final_url") or p.get("url", "")
+        if "noindex" in robots and _is_live(p):
+            url = _page_url(p)
             affected.append(url)
 
     if not affected:
@@ -0,0 +1,139 @@
+"""Disk-persisted crawl cache keyed by domain + robots.txt freshness token."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+
+from core.crawler import CRAWL_TIMEOUT, CrawlResult, create_session, crawl_site
+from utils.logger import get_logger
+from utils.url_utils import get_base_url, normalize_domain
+
+log = get_logger("crawl_cache")
+
+CACHE_DIR = Path(__file__).parent.parent / ".crawl_cache"
+CACHE_TTL = 24 * 3600  # seconds
+TRANSIENT_ERRORS = {"timeout", "request_failed"}  # page errors a re-crawl may not repeat
+
+
+def _cache_path(domain: str, token: str) -> Path:
+    digest = hashlib.blake2b(f"{domain}:{token}".encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.pkl"
+
+
+def load(domain: str, token: str, ttl: int = CACHE_TTL) -> Optional[CrawlResult]:
+    """Return a cached CrawlResult if present and fresh, else None."""
+    path = _cache_path(domain, token)
+    try:
+        stored_at, result = pickle.loads(path.read_bytes())
+    except Exception:
+        return None
+
+    if time.time() - stored_at > ttl:
+        path.unlink(missing_ok=True)
+        return None
+    return result
+
+
+def save(domain: str, token: str, result: CrawlResult) -> None:
+    """Persist a CrawlResult with the current timestamp."""
+    try:
+        data = pickle.dumps((time.time(), result))
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so a concurrent load never sees a partial pickle
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, _cache_path(domain, token))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        log.warning(f"Could not write crawl cache: {e}")
+    _prune()
+
+
+def _prune(ttl: int = CACHE_TTL) -> None:
+    """Delete expired entries, including ones whose token will never be asked for again."""
+    cutoff = time.time() - ttl
+    for path in CACHE_DIR.glob("*.pkl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _cacheable(result: CrawlResult) -> bool:
+    """True if the crawl reached at least one live page and hit no transient errors."""
+    pages = result.pages
+    if any(p.error in TRANSIENT_ERRORS for p in pages):
+        return False
+    return any(not p.error and p.status and p.status < 400 for p in pages)
+
+
+def clear() -> int:
+    """Delete every cached crawl; returns the number of entries removed."""
+    removed = 0
+    for path in CACHE_DIR.glob("*.pkl"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+async def _head_robots(session: aiohttp.ClientSession, robots_url: str) -> str:
+    async with session.head(
+        robots_url, timeout=aiohttp.ClientTimeout(total=CRAWL_TIMEOUT)
+    ) as resp:
+        return resp.headers.get("ETag") or resp.headers.get("Last-Modified") or ""
+
+
+async def _freshness_token(
+    base_url: str, session: Optional[aiohttp.ClientSession] = None
+) -> str:
+    """Return robots.txt ETag or Last-Modified (empty if unavailable)."""
+    robots_url = base_url.rstrip("/") + "/robots.txt"
+    try:
+        if session is not None:
+            return await _head_robots(session, robots_url)
+        async with create_session() as own_session:
+            return await _head_robots(own_session, robots_url)
+    except Exception:
+        return ""
+
+
+async def crawl_site_cached(
+    url_input: str,
+    progress_cb=None,
+    session: Optional[aiohttp.ClientSession] = None,
+    refresh: bool = False,
+    **kwargs,
+) -> CrawlResult:
+    """crawl_site(), served from disk when the site's robots.txt hasn't changed.
+
+    ``refresh`` skips the lookup and re-crawls; the fresh result replaces the entry.
+    Crawls with no live pages or with timed-out/failed requests are not stored.
+    """
+    base_url = get_base_url(url_input)
+    domain = normalize_domain(base_url)
+    token = await _freshness_token(base_url, session)
+
+    cached = None if refresh else load(domain, token)
+    if cached is not None:
+        log.info(f"Crawl cache hit for {domain}")
+        if progress_cb:
+            progress_cb(80, "Loaded cached crawl. Preparing data...")
+        return cached
+
+    result = await crawl_site(url_input, progress_cb=progress_cb, session=session, **kwargs)
+    if _cacheable(result):
+        save(domain, token, result)
+    else:
+        log.info(f"Not caching degraded crawl of {domain}")
+    return result
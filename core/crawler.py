@@ -2,15 +2,18 @@
 
 import asyncio
 import gzip
+import os
 import re
 import time
 import xml.etree.ElementTree as ET
 from collections import defaultdict
 from dataclasses import dataclass, field
+from io import BytesIO
 from typing import Optional
 from urllib.parse import urlparse, urljoin
 
 import aiohttp
+import soupsieve
 from bs4 import BeautifulSoup
 
 from utils.logger import get_logger
@@ -26,11 +29,35 @@ from utils.url_utils import (
 
 log = get_logger("crawler")
 
+CONCURRENCY_RANGE = (5, 50)  # bounds of the sidebar concurrency slider
+DEFAULT_CONCURRENCY = 10
+
+
+def _concurrency_from_env() -> int:
+    """Read QW_CONCURRENCY, falling back to the default and clamping to CONCURRENCY_RANGE."""
+    raw = os.getenv("QW_CONCURRENCY", "")
+    if not raw.strip():
+        return DEFAULT_CONCURRENCY
+    try:
+        value = int(raw)
+    except ValueError:
+        log.warning(f"Ignoring non-integer QW_CONCURRENCY={raw!r}")
+        return DEFAULT_CONCURRENCY
+    low, high = CONCURRENCY_RANGE
+    if not low <= value <= high:
+        log.warning(f"QW_CONCURRENCY={value} is outside {low}-{high}; clamping")
+    return min(max(value, low), high)
+
+
 CRAWL_TIMEOUT = 8
 MAX_PAGES = 60
-MAX_CONCURRENT = 10
+MAX_CONCURRENT = _concurrency_from_env()
+MAX_SITEMAP_URLS = 5000
 MAX_INTERNAL_LINKS_PER_PAGE = 15
 MAX_BROKEN_LINK_CHECKS = 100
+DNS_CACHE_TTL = 300  # seconds; the shared session outlives many audits
+MAX_HTML_BYTES = 2_000_000  # larger pages are truncated before parsing
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
 COMMON_SITEMAP_PATHS = [
@@ -112,33 +139,43 @@ def _headers() -> dict:
     return {"User-Agent": USER_AGENT}
 
 
+def create_session() -> aiohttp.ClientSession:
+    """Create a pooled keep-alive HTTP session; must be called inside a running loop."""
+    connector = aiohttp.TCPConnector(keepalive_timeout=60, ttl_dns_cache=DNS_CACHE_TTL)
+    # The session is shared across audits and users; never replay one site's cookies
+    return aiohttp.ClientSession(
+        headers=_headers(), connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+    )
+
+
 # ─── Sitemap Discovery ─────────────────────────────────────────
 
 
-def _parse_sitemap_xml(xml_text: str) -> tuple[list[str], list[str]]:
-    """Parse sitemap XML, return (urls, sub_sitemaps)."""
+def _parse_sitemap_xml(xml: bytes | str) -> tuple[list[str], list[str]]:
+    """Stream-parse sitemap XML, return (urls, sub_sitemaps)."""
+    if isinstance(xml, str):
+        xml = xml.encode("utf-8")
+
     urls, sitemaps = [], []
+    target = urls
     try:
-        root = ET.fromstring(xml_text)
+        for event, el in ET.iterparse(BytesIO(xml), events=("start", "end")):
+            tag = el.tag.lower()
+            if event == "start":
+                if tag.endswith("sitemapindex"):
+                    target = sitemaps
+                continue
+            if tag.endswith("loc") and el.text:
+                target.append(el.text.strip())
+            el.clear()
     except ET.ParseError:
-        return urls, sitemaps
-
-    tag_end = lambda el, name: el.tag.lower().endswith(name)
-
-    if tag_end(root, "sitemapindex"):
-        for el in root.iter():
-            if tag_end(el, "loc") and el.text:
-                sitemaps.append(el.text.strip())
-    else:
-        for el in root.iter():
-            if tag_end(el, "loc") and el.text:
-                urls.append(el.text.strip())
+        return [], []
 
     return urls, sitemaps
 
 
-async def _fetch_text(session: aiohttp.ClientSession, url: str) -> Optional[str]:
-    """Fetch URL and return text content, handling gzip."""
+async def _fetch_bytes(session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+    """Fetch URL and return the raw body, handling gzip."""
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=CRAWL_TIMEOUT)) as resp:
             if resp.status >= 400:
@@ -153,47 +190,83 @@ async def _fetch_text(session: aiohttp.ClientSession, url: str) -> Optional[str]
                 except Exception:
                     pass
 
-            return raw.decode("utf-8", errors="replace")
+            return raw
     except Exception as e:
         log.warning(f"Failed to fetch {url}: {e}")
         return None
 
 
+async def _fetch_text(session: aiohttp.ClientSession, url: str) -> Optional[str]:
+    """Fetch URL and return text content, handling gzip."""
+    raw = await _fetch_bytes(session, url)
+    return raw.decode("utf-8", errors="replace") if raw is not None else None
+
+
+async def _fetch_sitemap_doc(
+    session: aiohttp.ClientSession, sitemap_url: str, semaphore: asyncio.Semaphore
+) -> Optional[bytes]:
+    """Fetch one sitemap document, trying the gzipped variant if the plain one fails."""
+    async with semaphore:
+        xml = await _fetch_bytes(session, sitemap_url)
+        if not xml and not sitemap_url.endswith(".gz"):
+            xml = await _fetch_bytes(session, sitemap_url + ".gz")
+        return xml
+
+
 async def _fetch_sitemap_urls(
     session: aiohttp.ClientSession,
     sitemap_url: str,
-    max_urls: int = 5000,
-    depth: int = 0,
+    max_urls: int = MAX_SITEMAP_URLS,
+    max_depth: int = 3,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    concurrency: int = MAX_CONCURRENT,
+    seen: Optional[set] = None,
 ) -> list[str]:
-    """Recursively fetch URLs from a sitemap, handling sub-sitemaps and gzip."""
-    if depth > 3:
-        return []
-
-    text = await _fetch_text(session, sitemap_url)
-    if not text:
-        # Try gzipped version
-        if not sitemap_url.endswith(".gz"):
-            text = await _fetch_text(session, sitemap_url + ".gz")
-        if not text:
-            return []
-
-    urls, sub_sitemaps = _parse_sitemap_xml(text)
-    all_urls = list(urls)
-
-    for sm in sub_sitemaps[:20]:
-        if len(all_urls) >= max_urls:
-            break
-        sub_urls = await _fetch_sitemap_urls(session, sm, max_urls, depth + 1)
-        all_urls.extend(sub_urls)
+    """Fetch URLs from a sitemap breadth-first, following sub-sitemaps and gzip.
 
-    # Deduplicate preserving order
-    seen = set()
-    unique = []
-    for u in all_urls:
-        if u not in seen:
-            seen.add(u)
-            unique.append(u)
-    return unique[:max_urls]
+    Sub-sitemaps at the same depth are fetched ``concurrency`` at a time and
+    merged in declaration order; no further batches are started once
+    ``max_urls`` is reached. Calls that run at the same time should share one
+    ``semaphore`` (a single request limit) and one ``seen`` set, so they skip
+    each other's URLs and stop together once ``max_urls`` are found in total.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(concurrency)
+    if seen is None:
+        seen = set()
+    urls: list[str] = []
+    visited = {sitemap_url}
+    level = [sitemap_url]
+    depth = 0
+
+    while level:
+        next_level = []
+        for start in range(0, len(level), concurrency):
+            if len(seen) >= max_urls:
+                return urls
+            docs = await asyncio.gather(
+                *(_fetch_sitemap_doc(session, sm, semaphore)
+                  for sm in level[start:start + concurrency])
+            )
+            for xml in docs:
+                if not xml:
+                    continue
+                page_urls, sub_sitemaps = _parse_sitemap_xml(xml)
+                for u in page_urls:
+                    if len(seen) >= max_urls:
+                        return urls
+                    if u not in seen:
+                        seen.add(u)
+                        urls.append(u)
+                if depth < max_depth:
+                    for sub in sub_sitemaps[:20]:
+                        if sub not in visited:
+                            visited.add(sub)
+                            next_level.append(sub)
+        level = next_level
+        depth += 1
+
+    return urls
 
 
 async def _discover_from_robots(
@@ -216,7 +289,10 @@ async def _discover_from_robots(
 
 
 async def _discover_urls(
-    session: aiohttp.ClientSession, base_url: str
+    session: aiohttp.ClientSession,
+    base_url: str,
+    concurrency: int = MAX_CONCURRENT,
+    max_urls: int = MAX_SITEMAP_URLS,
 ) -> tuple[list[str], str, bool]:
     """
     Full sitemap discovery chain:
@@ -232,21 +308,27 @@ async def _discover_urls(
 
     if robot_sitemaps:
         log.info(f"Found {len(robot_sitemaps)} sitemap(s) in robots.txt")
+        # Per-language/section sitemaps are independent; fetch them all at once,
+        # under one request limit and one URL budget shared by every walk
+        semaphore = asyncio.Semaphore(concurrency)
+        seen = set()
+        per_sitemap = await asyncio.gather(
+            *(_fetch_sitemap_urls(session, sm, max_urls, semaphore=semaphore,
+                                  concurrency=concurrency, seen=seen)
+              for sm in robot_sitemaps)
+        )
         all_urls = []
-        for sm in robot_sitemaps:
-            urls = await _fetch_sitemap_urls(session, sm)
+        for sm, urls in zip(robot_sitemaps, per_sitemap):
             all_urls.extend(urls)
             log.info(f"  {sm} → {len(urls)} URLs")
         if all_urls:
-            seen = set()
-            unique = [u for u in all_urls if u not in seen and not seen.add(u)]
-            return unique, f"robots.txt ({len(robot_sitemaps)} sitemaps)", False
+            return all_urls, f"robots.txt ({len(robot_sitemaps)} sitemaps)", False
 
     # Step 2: Common sitemap paths
     log.info("No sitemaps in robots.txt, trying common paths...")
     for path in COMMON_SITEMAP_PATHS:
         sm_url = base_url.rstrip("/") + path
-        urls = await _fetch_sitemap_urls(session, sm_url)
+        urls = await _fetch_sitemap_urls(session, sm_url, max_urls, concurrency=concurrency)
         if urls:
             log.info(f"Found sitemap at {path} → {len(urls)} URLs")
             return urls, f"sitemap ({path})", False
@@ -261,6 +343,7 @@ async def _crawl_from_homepage(
     base_url: str,
     base_domain: str,
     max_pages: int = MAX_PAGES,
+    concurrency: int = MAX_CONCURRENT,
 ) -> list[str]:
     """Discover URLs by following internal links from the homepage."""
     discovered = [base_url]
@@ -268,8 +351,8 @@ async def _crawl_from_homepage(
     to_visit = [base_url]
 
     while to_visit and len(discovered) < max_pages * 3:
-        batch = to_visit[:MAX_CONCURRENT]
-        to_visit = to_visit[MAX_CONCURRENT:]
+        batch = to_visit[:concurrency]
+        to_visit = to_visit[concurrency:]
 
         tasks = [_fetch_page_html(session, url) for url in batch]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -294,9 +377,31 @@ async def _crawl_from_homepage(
     return discovered
 
 
+async def _read_capped(resp: aiohttp.ClientResponse, limit: int = MAX_HTML_BYTES) -> bytes:
+    """Read at most `limit` bytes of a response body."""
+    chunks = []
+    total = 0
+    async for chunk in resp.content.iter_chunked(64 * 1024):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= limit:
+            break
+    return b"".join(chunks)[:limit]
+
+
+def _decode_html(raw: bytes, charset: Optional[str]) -> str | bytes:
+    """Decode with the HTTP charset; without one, return bytes so the parser can sniff <meta charset>."""
+    if charset:
+        try:
+            return raw.decode(charset, errors="replace")
+        except LookupError:
+            pass
+    return raw
+
+
 async def _fetch_page_html(
     session: aiohttp.ClientSession, url: str
-) -> Optional[tuple[str, str]]:
+) -> Optional[tuple[str | bytes, str]]:
     """Fetch a page and return (html, final_url) or None."""
     try:
         async with session.get(
@@ -305,7 +410,7 @@ async def _fetch_page_html(
             content_type = resp.headers.get("Content-Type", "")
             if "text/html" not in content_type.lower():
                 return None
-            html = await resp.text(errors="replace")
+            html = _decode_html(await _read_capped(resp), resp.charset)
             return html, str(resp.url)
     except Exception:
         return None
@@ -314,7 +419,14 @@ async def _fetch_page_html(
 # ─── Signal Extraction ──────────────────────────────────────────
 
 
-def extract_signals(html: str, url: str, final_url: str, status: int, base_domain: str) -> PageSignals:
+# Compiled once; soupsieve matches in a single traversal that stops at the first hit
+CANONICAL_SELECTOR = soupsieve.compile('link[rel~="canonical" i]')
+ROBOTS_META_SELECTOR = soupsieve.compile('meta[name="robots" i]')
+HREFLANG_SELECTOR = soupsieve.compile('link[rel~="alternate" i][hreflang]')
+WORD_RE = re.compile(r"\S+")
+
+
+def extract_signals(html: str | bytes, url: str, final_url: str, status: int, base_domain: str) -> PageSignals:
     """Extract all SEO signals from an HTML page."""
     signals = PageSignals(url=url, final_url=final_url, status=status)
 
@@ -330,27 +442,24 @@ def extract_signals(html: str, url: str, final_url: str, status: int, base_domai
         signals.meta_description = (meta_tag.get("content") or "").strip()
 
     # Canonical
-    canon = soup.find("link", attrs={"rel": lambda x: x and "canonical" in str(x).lower()})
+    canon = CANONICAL_SELECTOR.select_one(soup)
     if canon:
         signals.canonical = (canon.get("href") or "").strip()
 
     # Robots meta
-    robots = soup.find("meta", attrs={"name": lambda x: x and str(x).lower() == "robots"})
+    robots = ROBOTS_META_SELECTOR.select_one(soup)
     if robots:
         signals.robots_meta = (robots.get("content") or "").strip().lower()
 
-    # H1s
-    for h1 in soup.find_all("h1"):
-        text = h1.get_text(strip=True)
+    # Headings in one tree walk, grouped by level for the hierarchy check
+    headings = []
+    for h in soup.find_all(HEADING_TAGS):
+        text = h.get_text(strip=True)
         if text:
-            signals.h1s.append(text)
-
-    # All headings for hierarchy check
-    for level in range(1, 7):
-        for h in soup.find_all(f"h{level}"):
-            text = h.get_text(strip=True)
-            if text:
-                signals.headings.append((level, text[:100]))
+            headings.append((int(h.name[1]), text))
+    headings.sort(key=lambda lt: lt[0])
+    signals.h1s = [text for level, text in headings if level == 1]
+    signals.headings = [(level, text[:100]) for level, text in headings]
 
     # Word count
     body = soup.find("body")
@@ -358,7 +467,10 @@ def extract_signals(html: str, url: str, final_url: str, status: int, base_domai
         # Remove script and style elements
         for tag in body.find_all(["script", "style", "nav", "footer", "header"]):
             tag.decompose()
-        signals.word_count = len(body.get_text(" ", strip=True).split())
+        # Count per text node rather than joining the whole page into one string
+        signals.word_count = sum(
+            1 for text in body.stripped_strings for _ in WORD_RE.finditer(text)
+        )
 
     # Internal links
     for a in soup.find_all("a", href=True):
@@ -372,9 +484,7 @@ def extract_signals(html: str, url: str, final_url: str, status: int, base_domai
     signals.has_schema = bool(soup.find("script", attrs={"type": "application/ld+json"}))
 
     # Hreflang
-    signals.has_hreflang = bool(
-        soup.find("link", attrs={"rel": lambda x: x and "alternate" in str(x).lower(), "hreflang": True})
-    )
+    signals.has_hreflang = HREFLANG_SELECTOR.select_one(soup) is not None
 
     return signals
 
@@ -398,10 +508,18 @@ async def _fetch_and_extract(
                 final_url = str(resp.url)
                 content_type = resp.headers.get("Content-Type", "")
 
+                # Error pages are excluded from analysis, so skip reading and parsing them
+                if status >= 400:
+                    return PageSignals(url=url, final_url=final_url, status=status)
+
                 if "text/html" not in content_type.lower():
                     return PageSignals(url=url, final_url=final_url, status=status, error="non_html")
 
-                html = await resp.text(errors="replace")
+                raw = await _read_capped(resp)
+                if not raw.strip():
+                    return PageSignals(url=url, final_url=final_url, status=status)
+
+                html = _decode_html(raw, resp.charset)
                 return extract_signals(html, url, final_url, status, base_domain)
 
         except asyncio.TimeoutError:
@@ -468,9 +586,10 @@ async def _check_link(
 async def _check_broken_links(
     session: aiohttp.ClientSession,
     links: list[str],
+    concurrency: int = MAX_CONCURRENT,
 ) -> tuple[list[dict], list[dict]]:
     """Check links for broken status and redirect chains."""
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+    semaphore = asyncio.Semaphore(concurrency)
     tasks = [_check_link(session, url, semaphore) for url in links[:MAX_BROKEN_LINK_CHECKS]]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -492,40 +611,41 @@ async def _check_broken_links(
 
 def _sample_urls(urls: list[str], homepage: str, max_pages: int = MAX_PAGES) -> list[str]:
     """Intelligently sample URLs across site structure."""
-    urls = [u for u in urls if is_valid_page_url(u)]
-    # Deduplicate
+    # Deduplicate, normalizing each URL once
     seen = set()
     unique = []
     for u in urls:
+        if not is_valid_page_url(u):
+            continue
         norm = normalize_url(u)
         if norm not in seen:
             seen.add(norm)
-            unique.append(u)
+            unique.append((u, norm))
 
     sample = [homepage] if homepage else []
     sample_set = {normalize_url(homepage)} if homepage else set()
 
     # First pass: one from each bucket
     buckets = defaultdict(list)
-    for u in unique:
-        buckets[get_path_bucket(u)].append(u)
+    for u, norm in unique:
+        buckets[get_path_bucket(u)].append((u, norm))
 
     for _, bucket_urls in sorted(buckets.items()):
         if len(sample) >= max_pages:
             break
-        for u in bucket_urls:
-            if normalize_url(u) not in sample_set:
+        for u, norm in bucket_urls:
+            if norm not in sample_set:
                 sample.append(u)
-                sample_set.add(normalize_url(u))
+                sample_set.add(norm)
                 break
 
     # Fill remaining
-    for u in unique:
+    for u, norm in unique:
         if len(sample) >= max_pages:
             break
-        if normalize_url(u) not in sample_set:
+        if norm not in sample_set:
             sample.append(u)
-            sample_set.add(normalize_url(u))
+            sample_set.add(norm)
 
     return sample[:max_pages]
 
@@ -537,6 +657,8 @@ async def crawl_site(
     url_input: str,
     progress_cb=None,
     max_pages: int = MAX_PAGES,
+    session: Optional[aiohttp.ClientSession] = None,
+    concurrency: int = MAX_CONCURRENT,
 ) -> CrawlResult:
     """
     Main crawl entry point.
@@ -545,6 +667,9 @@ async def crawl_site(
         url_input: User-provided URL or domain
         progress_cb: Optional callback(percent, message)
         max_pages: Maximum pages to analyze
+        session: Optional long-lived session (see create_session) whose
+            keep-alive connections are reused; it is not closed here
+        concurrency: Maximum simultaneous requests to the site
 
     Returns:
         CrawlResult with all crawl data
@@ -556,76 +681,92 @@ async def crawl_site(
 
     log.info(f"Starting crawl of {base_domain}")
 
-    async with aiohttp.ClientSession(headers=_headers()) as session:
-        # ── Discover URLs ──
-        if progress_cb:
-            progress_cb(5, "Checking robots.txt and sitemaps...")
-
-        discovered, method, sitemap_missing = await _discover_urls(session, base_url)
+    if session is None:
+        async with create_session() as own_session:
+            return await _crawl(own_session, base_url, base_domain, progress_cb, max_pages, concurrency)
+    return await _crawl(session, base_url, base_domain, progress_cb, max_pages, concurrency)
 
-        if not discovered and sitemap_missing:
-            if progress_cb:
-                progress_cb(10, "No sitemap found. Crawling from homepage...")
-            discovered = await _crawl_from_homepage(session, base_url, base_domain, max_pages)
-            if not discovered:
-                discovered = [base_url]
 
-        if progress_cb:
-            progress_cb(15, f"Found {len(discovered)} URLs via {method}. Sampling...")
-
-        # ── Sample ──
-        sample = _sample_urls(discovered, base_url, max_pages)
-        log.info(f"Sampling {len(sample)} pages from {len(discovered)} discovered")
-
-        if progress_cb:
-            progress_cb(20, f"Analyzing {len(sample)} pages (10 concurrent)...")
-
-        # ── Fetch & Extract Signals ──
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT)
-        tasks = [_fetch_and_extract(session, url, base_domain, semaphore) for url in sample]
-
-        pages = []
-        total = len(tasks)
-        for i, coro in enumerate(asyncio.as_completed(tasks)):
-            page = await coro
-            pages.append(page)
-            if progress_cb and i % 5 == 0:
-                pct = 20 + int(40 * (i / total))
-                progress_cb(pct, f"Scanned {i + 1}/{total} pages...")
-
-        if progress_cb:
-            progress_cb(65, "Checking internal links for issues...")
-
-        # ── Collect unique internal links ──
-        all_links = set()
-        linked_urls = set()
-        for p in pages:
-            for link in p.internal_links:
-                norm = normalize_url(link)
-                linked_urls.add(norm)
-                if norm not in all_links and is_valid_page_url(link):
-                    all_links.add(norm)
+async def _crawl(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    base_domain: str,
+    progress_cb,
+    max_pages: int,
+    concurrency: int,
+) -> CrawlResult:
+    """Run discovery, sampling, signal extraction and link checks on one session."""
+    # ── Discover URLs ──
+    if progress_cb:
+        progress_cb(5, "Checking robots.txt and sitemaps...")
 
-        link_list = list(all_links)[:MAX_BROKEN_LINK_CHECKS]
-        broken, chains = await _check_broken_links(session, link_list)
+    discovered, method, sitemap_missing = await _discover_urls(session, base_url, concurrency)
 
+    if not discovered and sitemap_missing:
         if progress_cb:
-            progress_cb(80, "Crawl complete. Preparing data...")
-
-        log.info(
-            f"Crawl done: {len(pages)} pages, "
-            f"{len(broken)} broken links, {len(chains)} redirect chains"
+            progress_cb(10, "No sitemap found. Crawling from homepage...")
+        discovered = await _crawl_from_homepage(
+            session, base_url, base_domain, max_pages, concurrency
         )
+        if not discovered:
+            discovered = [base_url]
+
+    if progress_cb:
+        progress_cb(15, f"Found {len(discovered)} URLs via {method}. Sampling...")
+
+    # ── Sample ──
+    sample = _sample_urls(discovered, base_url, max_pages)
+    log.info(f"Sampling {len(sample)} pages from {len(discovered)} discovered")
+
+    if progress_cb:
+        progress_cb(20, f"Analyzing {len(sample)} pages ({concurrency} concurrent)...")
+
+    # ── Fetch & Extract Signals ──
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [_fetch_and_extract(session, url, base_domain, semaphore) for url in sample]
+
+    pages = []
+    total = len(tasks)
+    for i, coro in enumerate(asyncio.as_completed(tasks)):
+        page = await coro
+        pages.append(page)
+        if progress_cb and i % 5 == 0:
+            pct = 20 + int(40 * (i / total))
+            progress_cb(pct, f"Scanned {i + 1}/{total} pages...")
+
+    if progress_cb:
+        progress_cb(65, "Checking internal links for issues...")
+
+    # ── Collect unique internal links ──
+    all_links = set()
+    linked_urls = set()
+    for p in pages:
+        for link in p.internal_links:
+            norm = normalize_url(link)
+            linked_urls.add(norm)
+            if norm not in all_links and is_valid_page_url(link):
+                all_links.add(norm)
+
+    link_list = list(all_links)[:MAX_BROKEN_LINK_CHECKS]
+    broken, chains = await _check_broken_links(session, link_list, concurrency)
+
+    if progress_cb:
+        progress_cb(80, "Crawl complete. Preparing data...")
+
+    log.info(
+        f"Crawl done: {len(pages)} pages, "
+        f"{len(broken)} broken links, {len(chains)} redirect chains"
+    )
 
-        return CrawlResult(
-            domain=base_domain,
-            base_url=base_url,
-            discovery_method=method,
-            urls_discovered=len(discovered),
-            urls_analyzed=len(pages),
-            pages=pages,
-            broken_links=broken,
-            redirect_chains=chains,
-            all_discovered_urls=[normalize_url(u) for u in sample],
-            sitemap_missing=sitemap_missing,
-        )
+    return CrawlResult(
+        domain=base_domain,
+        base_url=base_url,
+        discovery_method=method,
+        urls_discovered=len(discovered),
+        urls_analyzed=len(pages),
+        pages=pages,
+        broken_links=broken,
+        redirect_chains=chains,
+        all_discovered_urls=[normalize_url(u) for u in sample],
+        sitemap_missing=sitemap_missing,
+    )
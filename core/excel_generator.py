@@ -3,6 +3,7 @@
 from io import BytesIO
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import (
     Alignment,
     Border,
@@ -10,6 +11,7 @@ from openpyxl.styles import (
     PatternFill,
     Side,
 )
+from openpyxl.utils import get_column_letter
 
 from utils.logger import get_logger
 
@@ -56,26 +58,47 @@ SEVERITY_STYLES = {
 
 CHECKED_FILL = PatternFill("solid", fgColor=GREEN_BG)
 ALT_ROW_FILL = PatternFill("solid", fgColor=GRAY_BG)
+TOP_5_FILL = PatternFill("solid", fgColor=BLUE_LIGHT)
+SEPARATOR_FILL = PatternFill("solid", fgColor="F3F4F6")
+SEPARATOR_FONT = Font(name="Inter", size=10, bold=True, color="6B7280")
+CHECKBOX_FONT = Font(name="Inter", size=14)
+
+CENTER = Alignment(horizontal="center")
+WRAP = Alignment(wrap_text=True)
+HEADER_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+# Quick win impact → severity style
+IMPACT_SEVERITY = {"high": "critical", "medium": "medium", "low": "low"}
 
 
 # ─── Helpers ────────────────────────────────────────────────────
 
 
-def _set_header_row(ws, headers: list[tuple[str, int]], row: int = 1) -> None:
-    """Write a styled header row."""
+def _cell(ws, value, font=BODY_FONT, fill=None, alignment=None) -> WriteOnlyCell:
+    """Build a bordered write-only cell; styles must be set before the row is appended."""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    cell.border = THIN_BORDER
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def _set_header_row(ws, headers: list[tuple[str, int]]) -> None:
+    """Size the columns, freeze and append a styled header row (must precede all other rows)."""
+    ws.freeze_panes = "A2"
+    row = []
     for col, (title, width) in enumerate(headers, 1):
-        cell = ws.cell(row=row, column=col, value=title)
+        ws.column_dimensions[get_column_letter(col)].width = width
+        cell = WriteOnlyCell(ws, value=title)
         cell.fill = HEADER_FILL
         cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        ws.column_dimensions[cell.column_letter].width = width
-    ws.row_dimensions[row].height = 30
-
-
-def _apply_row_border(ws, row: int, max_col: int) -> None:
-    """Apply bottom border to a row."""
-    for col in range(1, max_col + 1):
-        ws.cell(row=row, column=col).border = THIN_BORDER
+        cell.alignment = HEADER_ALIGN
+        row.append(cell)
+    ws.row_dimensions[1].height = 30
+    ws.append(row)
 
 
 # ─── Main Sheet: Action Plan ───────────────────────────────────
@@ -97,57 +120,34 @@ def _write_action_plan(ws, top_5: list, all_findings: dict) -> None:
 
     row = 2
 
-    # ── Top 5 Quick Wins ──
+    # ── Top 5 Quick Wins (highlighted light blue) ──
+    fill = TOP_5_FILL
     for i, win in enumerate(top_5, 1):
         impact = (win.get("impact") or "medium").lower()
         effort = (win.get("effort") or "medium").lower()
+        sev_key = IMPACT_SEVERITY.get(impact, "medium")
 
-        ws.cell(row=row, column=1, value=f"#{i}").font = BOLD_FONT
-        ws.cell(row=row, column=1).alignment = Alignment(horizontal="center")
-
-        cat_cell = ws.cell(row=row, column=2, value=win.get("category", "").title())
-        cat_cell.font = BODY_FONT
-
-        issue_cell = ws.cell(row=row, column=3, value=win.get("issue", ""))
-        issue_cell.font = BOLD_FONT
-        issue_cell.alignment = Alignment(wrap_text=True)
-
-        urls_cell = ws.cell(row=row, column=4, value=win.get("urls_affected", 0))
-        urls_cell.font = BODY_FONT
-        urls_cell.alignment = Alignment(horizontal="center")
-
-        action_cell = ws.cell(row=row, column=5, value=win.get("what_to_do", ""))
-        action_cell.font = BODY_FONT
-        action_cell.alignment = Alignment(wrap_text=True)
-
-        impact_cell = ws.cell(row=row, column=6, value=impact.upper())
-        sev_key = {"high": "critical", "medium": "medium", "low": "low"}.get(impact, "medium")
-        impact_cell.font = SEVERITY_STYLES.get(sev_key, {}).get("font", BODY_FONT)
-        impact_cell.alignment = Alignment(horizontal="center")
-
-        effort_cell = ws.cell(row=row, column=7, value=effort.upper())
-        effort_cell.font = BODY_FONT
-        effort_cell.alignment = Alignment(horizontal="center")
-
-        # Checkbox using Unicode
-        status_cell = ws.cell(row=row, column=8, value="\u2610")  # ☐
-        status_cell.font = Font(name="Inter", size=14)
-        status_cell.alignment = Alignment(horizontal="center")
-
-        # Highlight row with light blue for top 5
-        for col in range(1, 9):
-            ws.cell(row=row, column=col).fill = PatternFill("solid", fgColor=BLUE_LIGHT)
-
-        _apply_row_border(ws, row, 8)
         ws.row_dimensions[row].height = 45
+        ws.append([
+            _cell(ws, f"#{i}", BOLD_FONT, fill, CENTER),
+            _cell(ws, win.get("category", "").title(), BODY_FONT, fill),
+            _cell(ws, win.get("issue", ""), BOLD_FONT, fill, WRAP),
+            _cell(ws, win.get("urls_affected", 0), BODY_FONT, fill, CENTER),
+            _cell(ws, win.get("what_to_do", ""), BODY_FONT, fill, WRAP),
+            _cell(ws, impact.upper(), SEVERITY_STYLES.get(sev_key, {}).get("font", BODY_FONT), fill, CENTER),
+            _cell(ws, effort.upper(), BODY_FONT, fill, CENTER),
+            # Checkbox using Unicode
+            _cell(ws, "\u2610", CHECKBOX_FONT, fill, CENTER),  # ☐
+        ])
         row += 1
 
     # ── Separator row ──
-    sep_cell = ws.cell(row=row, column=1, value="ALL FINDINGS")
-    sep_cell.font = Font(name="Inter", size=10, bold=True, color="6B7280")
-    ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=8)
-    sep_cell.fill = PatternFill("solid", fgColor="F3F4F6")
-    sep_cell.alignment = Alignment(horizontal="center")
+    sep_cell = WriteOnlyCell(ws, value="ALL FINDINGS")
+    sep_cell.font = SEPARATOR_FONT
+    sep_cell.fill = SEPARATOR_FILL
+    sep_cell.alignment = CENTER
+    ws.append([sep_cell])
+    ws.merged_cells.add(f"A{row}:H{row}")
     row += 1
 
     # ── All Findings ──
@@ -156,44 +156,30 @@ def _write_action_plan(ws, top_5: list, all_findings: dict) -> None:
             continue
         for finding in findings:
             severity = (finding.get("severity") or "medium").lower()
-
-            ws.cell(row=row, column=1, value="").font = BODY_FONT
-
-            ws.cell(row=row, column=2, value=category_name.title()).font = BODY_FONT
-
-            issue_cell = ws.cell(row=row, column=3, value=finding.get("issue", ""))
-            issue_cell.font = BODY_FONT
-            issue_cell.alignment = Alignment(wrap_text=True)
-
-            ws.cell(row=row, column=4, value=finding.get("count", 0)).font = BODY_FONT
-            ws.cell(row=row, column=4).alignment = Alignment(horizontal="center")
-
-            ws.cell(row=row, column=5, value="").font = BODY_FONT
-
-            sev_cell = ws.cell(row=row, column=6, value=severity.upper())
             style = SEVERITY_STYLES.get(severity, {})
-            sev_cell.font = style.get("font", BODY_FONT)
-            sev_cell.fill = style.get("fill", PatternFill())
-            sev_cell.alignment = Alignment(horizontal="center")
 
-            ws.cell(row=row, column=7, value="").font = BODY_FONT
-
-            status_cell = ws.cell(row=row, column=8, value="\u2610")
-            status_cell.font = Font(name="Inter", size=14)
-            status_cell.alignment = Alignment(horizontal="center")
-
-            # Alternating row colors
-            if row % 2 == 0:
-                for col in range(1, 9):
-                    if not ws.cell(row=row, column=col).fill or ws.cell(row=row, column=col).fill.fgColor.rgb == "00000000":
-                        ws.cell(row=row, column=col).fill = ALT_ROW_FILL
-
-            _apply_row_border(ws, row, 8)
+            # Alternating row colors (severity cells keep their own fill)
+            alt = ALT_ROW_FILL if row % 2 == 0 else None
+
+            ws.append([
+                _cell(ws, "", BODY_FONT, alt),
+                _cell(ws, category_name.title(), BODY_FONT, alt),
+                _cell(ws, finding.get("issue", ""), BODY_FONT, alt, WRAP),
+                _cell(ws, finding.get("count", 0), BODY_FONT, alt, CENTER),
+                _cell(ws, "", BODY_FONT, alt),
+                _cell(
+                    ws,
+                    severity.upper(),
+                    style.get("font", BODY_FONT),
+                    style.get("fill", alt),
+                    CENTER,
+                ),
+                _cell(ws, "", BODY_FONT, alt),
+                _cell(ws, "\u2610", CHECKBOX_FONT, alt, CENTER),
+            ])
             row += 1
 
-    # Auto filter and freeze
     ws.auto_filter.ref = f"A1:H{row - 1}"
-    ws.freeze_panes = "A2"
 
 
 # ─── Detail Sheets ──────────────────────────────────────────────
@@ -219,25 +205,20 @@ def _write_detail_sheet(wb, category: str, findings: list) -> None:
         urls = finding.get("urls", [])
 
         for url in urls[:50]:
-            ws.cell(row=row, column=1, value=issue_name).font = BODY_FONT
-            ws.cell(row=row, column=1).alignment = Alignment(wrap_text=True)
-
-            sev_cell = ws.cell(row=row, column=2, value=severity.upper())
-            style = SEVERITY_STYLES.get(severity, {})
-            sev_cell.font = style.get("font", BODY_FONT)
-            sev_cell.alignment = Alignment(horizontal="center")
-
-            url_cell = ws.cell(row=row, column=3, value=url)
-            url_cell.font = LINK_FONT
-            url_cell.alignment = Alignment(wrap_text=True)
-
-            ws.cell(row=row, column=4, value="").font = BODY_FONT
-
-            _apply_row_border(ws, row, 4)
+            ws.append([
+                _cell(ws, issue_name, alignment=WRAP),
+                _cell(
+                    ws,
+                    severity.upper(),
+                    SEVERITY_STYLES.get(severity, {}).get("font", BODY_FONT),
+                    alignment=CENTER,
+                ),
+                _cell(ws, url, LINK_FONT, alignment=WRAP),
+                _cell(ws, ""),
+            ])
             row += 1
 
     ws.auto_filter.ref = f"A1:D{max(row - 1, 1)}"
-    ws.freeze_panes = "A2"
 
 
 # ─── Public API ─────────────────────────────────────────────────
@@ -261,9 +242,9 @@ def create_action_plan(
     """
     log.info("Generating Excel action plan...")
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Action Plan"
+    # Write-only mode streams rows to the file instead of keeping a Cell per value
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Action Plan")
 
     _write_action_plan(ws, top_5, all_findings)
 
@@ -278,3 +259,8 @@ def create_action_plan(
 
     log.info("Excel action plan generated")
     return output
+
+
+def action_plan_bytes(top_5: list, all_findings: dict, domain: str = "") -> bytes:
+    """Build the Excel Action Plan and return its raw bytes."""
+    return create_action_plan(top_5, all_findings, domain).getvalue()
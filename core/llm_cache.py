@@ -0,0 +1,106 @@
+"""Response cache for LLM prioritization, keyed by a stable hash of the audit."""
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+
+from utils.logger import get_logger
+
+log = get_logger("llm_cache")
+
+CACHE_DIR = Path(__file__).parent.parent / ".llm_cache"
+CACHE_TTL = 24 * 3600  # seconds
+MAX_ENTRIES = 256
+
+
+def stable_hash(payload) -> str:
+    """Hash any JSON-serializable payload (dataclasses included) independently of dict key order."""
+    raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def cache_key(analysis_dict: dict, crawl_dict: dict, model: str, prompt_version: str = "") -> str:
+    """Build a stable key from the analysis, crawl summary, model name and prompt version."""
+    return stable_hash({
+        "analysis": analysis_dict,
+        "crawl": crawl_dict,
+        "model": model,
+        "prompt": prompt_version,
+    })
+
+
+def get_cached(cache: dict, key: str, ttl: int = CACHE_TTL) -> dict | None:
+    """Return a cached result if present and not expired, else None."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+
+    stored_at, result = entry
+    if time.time() - stored_at > ttl:
+        cache.pop(key, None)
+        return None
+
+    log.info(f"LLM cache hit ({key[:8]})")
+    return result
+
+
+def store(cache: dict, key: str, result: dict, max_entries: int = MAX_ENTRIES) -> None:
+    """Store a result with the current timestamp, evicting the oldest beyond max_entries."""
+    cache.pop(key, None)
+    cache[key] = (time.time(), result)
+    while len(cache) > max_entries:
+        cache.pop(next(iter(cache)))
+
+
+# ─── Persistent Store ───────────────────────────────────────────
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.json"
+
+
+def load(key: str, ttl: int = CACHE_TTL) -> dict | None:
+    """Return a result persisted on disk if present and fresh, else None."""
+    path = _cache_path(key)
+    try:
+        entry = orjson.loads(path.read_bytes())
+    except Exception:
+        return None
+
+    if time.time() - entry["stored_at"] > ttl:
+        path.unlink(missing_ok=True)
+        return None
+
+    log.info(f"LLM disk cache hit ({key[:8]})")
+    return entry["result"]
+
+
+def save(key: str, result: dict) -> None:
+    """Persist a result so it survives process restarts."""
+    try:
+        data = orjson.dumps({"stored_at": time.time(), "result": result})
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so concurrent sessions never read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, _cache_path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, TypeError) as e:
+        log.warning(f"Could not write LLM cache: {e}")
+
+
+def clear() -> int:
+    """Delete every persisted result; returns the number of entries removed."""
+    removed = 0
+    for path in CACHE_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
@@ -1,17 +1,24 @@
 """LLM integration for Quick Wins prioritization using Gemini 3 Flash."""
 
-import json
-import re
+import asyncio
+import functools
+import hashlib
 from pathlib import Path
+from typing import Callable
 
 import google.generativeai as genai
+import orjson
 
+from core.llm_response import chunk_text, parse_json_response
 from utils.logger import get_logger
 
 log = get_logger("llm")
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 PROMPT_FILE = PROMPTS_DIR / "prioritization.md"
+MODEL_NAME = "gemini-3-flash-preview"
+
+_warmed = False
 
 
 def configure(api_key: str) -> None:
@@ -20,69 +27,71 @@ def configure(api_key: str) -> None:
     log.info("Gemini API configured")
 
 
+async def warm_up() -> None:
+    """Fetch model metadata once so the first real call skips client cold start."""
+    global _warmed
+    if _warmed:
+        return
+    try:
+        await asyncio.to_thread(genai.get_model, f"models/{MODEL_NAME}")
+        _warmed = True
+        log.info("Gemini client warmed up")
+    except Exception as e:
+        log.warning(f"Gemini warm-up failed: {e}")
+
+
+@functools.lru_cache(maxsize=8)
+def _read_prompt(path: Path, mtime: float) -> str:
+    return path.read_text(encoding="utf-8")
+
+
 def _load_prompt() -> str:
-    """Load the prioritization prompt template."""
+    """Load the prioritization prompt template (re-read only when the file changes)."""
     if not PROMPT_FILE.exists():
         raise FileNotFoundError(f"Prompt file not found: {PROMPT_FILE}")
-    return PROMPT_FILE.read_text(encoding="utf-8")
+    return _read_prompt(PROMPT_FILE, PROMPT_FILE.stat().st_mtime)
 
 
-def _strip_json_fences(text: str) -> str:
-    """Remove markdown code fences from JSON response."""
-    t = (text or "").strip()
-    t = re.sub(r"^```(?:json)?\s*", "", t, flags=re.IGNORECASE)
-    t = re.sub(r"\s*```$", "", t)
-    return t.strip()
+def prompt_version() -> str:
+    """Fingerprint the prompt template so editing it invalidates cached responses."""
+    return hashlib.blake2b(_load_prompt().encode("utf-8"), digest_size=8).hexdigest()
 
 
-def _parse_json_response(raw: str) -> dict | None:
-    """Extract valid JSON from LLM response, handling edge cases."""
-    if not raw:
-        return None
-
-    cleaned = _strip_json_fences(raw)
+def _call_gemini(prompt: str, on_chunk: Callable[[int], None] | None = None) -> str:
+    """Call Gemini 3 Flash and return raw text response.
 
-    # Try direct parse
-    try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
-
-    # Try extracting JSON object
-    depth, start = 0, None
-    for i, ch in enumerate(cleaned):
-        if ch == "{":
-            if depth == 0:
-                start = i
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0 and start is not None:
-                try:
-                    return json.loads(cleaned[start : i + 1])
-                except json.JSONDecodeError:
-                    pass
-
-    log.error("Failed to parse JSON from LLM response")
-    return None
-
-
-def _call_gemini(prompt: str) -> str:
-    """Call Gemini 3 Flash and return raw text response."""
-    model = genai.GenerativeModel("gemini-3-flash-preview")
-    response = model.generate_content(prompt)
-    text = (getattr(response, "text", "") or "").strip()
+    With ``on_chunk`` the response is streamed and the callback receives the
+    running character count after each chunk.
+    """
+    model = genai.GenerativeModel(MODEL_NAME)
+    if on_chunk is None:
+        response = model.generate_content(prompt)
+        text = chunk_text(response).strip()
+    else:
+        parts = []
+        received = 0
+        for chunk in model.generate_content(prompt, stream=True):
+            part = chunk_text(chunk)
+            parts.append(part)
+            received += len(part)
+            on_chunk(received)
+        text = "".join(parts).strip()
     log.info(f"Gemini response: {len(text)} chars")
     return text
 
 
-def prioritize_quickwins(analysis_dict: dict, crawl_dict: dict) -> dict | None:
+def prioritize_quickwins(
+    analysis_dict: dict,
+    crawl_dict: dict,
+    on_chunk: Callable[[int], None] | None = None,
+) -> dict | None:
     """
     Send analysis results to Gemini for Top 5 prioritization.
 
     Args:
         analysis_dict: AnalysisResult.to_dict()
         crawl_dict: CrawlResult.to_dict() (summary for context)
+        on_chunk: Optional callback(chars_received), called as the response streams
 
     Returns:
         Parsed JSON with top_5_quick_wins and all_findings, or None on failure
@@ -101,12 +110,12 @@ def prioritize_quickwins(analysis_dict: dict, crawl_dict: dict) -> dict | None:
 
     prompt = template.replace(
         "{{CONTEXT_JSON}}",
-        json.dumps(context, ensure_ascii=False, indent=2),
+        orjson.dumps(context, option=orjson.OPT_INDENT_2).decode("utf-8"),
     )
 
     log.info("Calling Gemini for quick wins prioritization...")
     try:
-        raw = _call_gemini(prompt)
+        raw = _call_gemini(prompt, on_chunk)
     except Exception as e:
         log.error(f"Gemini API error: {e}")
         return None
@@ -115,14 +124,10 @@ def prioritize_quickwins(analysis_dict: dict, crawl_dict: dict) -> dict | None:
         log.error("Gemini returned empty response")
         return None
 
-    result = _parse_json_response(raw)
+    result = parse_json_response(raw)
     if not result:
         log.error("Could not parse Gemini response as JSON")
         log.debug(f"Raw response (first 500 chars): {raw[:500]}")
         return None
 
-    # Validate expected structure
-    if "top_5_quick_wins" not in result:
-        log.warning("Response missing 'top_5_quick_wins' key")
-
     return result
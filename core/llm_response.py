@@ -0,0 +1,65 @@
+"""Parsing of Gemini responses, kept free of the SDK import so it is testable offline."""
+
+import json
+import re
+
+import orjson
+
+from utils.logger import get_logger
+
+log = get_logger("llm")
+
+FENCE_LEAD_RE = re.compile(r"^```(?:json)?\s*", re.IGNORECASE)
+FENCE_TAIL_RE = re.compile(r"\s*```$")
+
+
+def chunk_text(chunk) -> str:
+    """Text of a Gemini response or stream chunk, or "" if it carries none.
+
+    The SDK's ``.text`` accessor raises ValueError for chunks without text
+    parts (e.g. a final chunk carrying only the finish reason or safety
+    ratings), which getattr's default does not catch.
+    """
+    try:
+        return getattr(chunk, "text", "") or ""
+    except ValueError:
+        return ""
+
+
+def strip_json_fences(text: str) -> str:
+    """Remove markdown code fences from JSON response."""
+    t = (text or "").strip()
+    t = FENCE_LEAD_RE.sub("", t)
+    t = FENCE_TAIL_RE.sub("", t)
+    return t.strip()
+
+
+def parse_json_response(raw: str) -> dict | None:
+    """Extract the prioritization JSON from an LLM response, handling edge cases."""
+    if not raw:
+        return None
+
+    cleaned = strip_json_fences(raw)
+
+    # Try direct parse
+    try:
+        result = orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
+        # Decode only the outermost object after any leading prose; retrying at
+        # later braces would turn a truncated reply into a nested fragment
+        result = None
+        start = cleaned.find("{")
+        if start != -1:
+            try:
+                result, _ = json.JSONDecoder().raw_decode(cleaned, start)
+            except ValueError:
+                pass
+
+    if not isinstance(result, dict) or "top_5_quick_wins" not in result:
+        log.error("Failed to parse JSON from LLM response")
+        return None
+    if "all_findings" not in result:
+        # The app falls back to the analyzer's findings for an empty dict
+        log.warning("Response missing 'all_findings' key")
+        result["all_findings"] = {}
+    return result
@@ -0,0 +1,136 @@
+"""Similarity cache for LLM prioritization — reuses results for near-identical audits."""
+
+import math
+
+from utils.logger import get_logger
+
+log = get_logger("semantic_cache")
+
+SIMILARITY_THRESHOLD = 0.95
+COUNT_TOLERANCE = 0.1  # relative drift allowed per issue type
+COUNT_TOLERANCE_MIN = 1.0  # ...but always allow a one-page difference
+MAX_ENTRIES = 50
+EXAMPLE_URL_LIMIT = 5
+
+CATEGORIES = {
+    "content_issues": "content",
+    "heading_issues": "headings",
+    "link_issues": "links",
+    "technical_issues": "technical",
+}
+ISSUE_KEYS = tuple(CATEGORIES)
+
+
+def findings_vector(analysis_dict: dict) -> dict[str, float]:
+    """Summarize an analysis as a sparse {issue_type: affected_count} vector."""
+    vector = {}
+    for key in ISSUE_KEYS:
+        for issue in analysis_dict.get(key, []):
+            vector[issue["issue_type"]] = float(issue.get("affected_count", 0))
+    if analysis_dict.get("sitemap_missing"):
+        vector["sitemap_missing"] = 1.0
+    return vector
+
+
+def cosine_similarity(a: dict[str, float], b: dict[str, float]) -> float:
+    """Cosine similarity between two sparse vectors."""
+    dot = sum(v * b.get(k, 0.0) for k, v in a.items())
+    norm_a = math.sqrt(sum(v * v for v in a.values()))
+    norm_b = math.sqrt(sum(v * v for v in b.values()))
+    if not norm_a or not norm_b:
+        return 1.0 if norm_a == norm_b else 0.0
+    return dot / (norm_a * norm_b)
+
+
+def counts_close(a: dict[str, float], b: dict[str, float]) -> bool:
+    """True if both vectors cover the same issue types with only small count drift.
+
+    Cosine similarity ignores scale (every count tripling still scores 1.0) and
+    barely moves when one new issue type appears, so it can't decide a hit alone.
+    """
+    if a.keys() != b.keys():
+        return False
+    return all(
+        abs(a[k] - b[k]) <= max(COUNT_TOLERANCE_MIN, COUNT_TOLERANCE * max(a[k], b[k]))
+        for k in a
+    )
+
+
+def lookup(
+    entries: list,
+    domain: str,
+    vector: dict[str, float],
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> dict | None:
+    """Return the closest cached result for the same domain and issue profile."""
+    best_score, best_result = 0.0, None
+    for entry_domain, entry_vector, result in entries:
+        if entry_domain != domain or not counts_close(vector, entry_vector):
+            continue
+        score = cosine_similarity(vector, entry_vector)
+        if score > best_score:
+            best_score, best_result = score, result
+
+    if best_result is not None and best_score >= threshold:
+        log.info(f"Semantic cache hit for {domain} (similarity {best_score:.3f})")
+        return best_result
+    return None
+
+
+def add(entries: list, domain: str, vector: dict[str, float], result: dict) -> None:
+    """Append a result, evicting the oldest entries beyond MAX_ENTRIES."""
+    entries.append((domain, vector, result))
+    del entries[:-MAX_ENTRIES]
+
+
+def _rebase_win(win: dict, candidates: list) -> dict:
+    """Point a cached quick win at the matching current issue.
+
+    Only the structured fields are refreshed; the prose is left as written,
+    since lookup() only serves results whose counts are within tolerance.
+    """
+    examples = set(win.get("example_urls") or [])
+    match = next(
+        (i for i in candidates if examples & set(i.get("affected_urls", []))), None
+    )
+    if match is None and len(candidates) == 1:
+        match = candidates[0]
+    if match is None:
+        return win
+
+    return {
+        **win,
+        "urls_affected": match.get("affected_count", 0),
+        "example_urls": match.get("affected_urls", [])[:EXAMPLE_URL_LIMIT],
+    }
+
+
+def rebase(cached: dict, analysis_dict: dict, domain: str) -> dict:
+    """Reuse a similar audit's Top 5 wording on top of the current analysis.
+
+    Score, findings and per-win counts always come from the current audit;
+    only the LLM's prose is borrowed from the cached result.
+    """
+    issues = {category: analysis_dict.get(key, []) for key, category in CATEGORIES.items()}
+    all_findings = {
+        category: [
+            {
+                "issue": i.get("title", ""),
+                "type": i.get("issue_type", ""),
+                "severity": i.get("severity", "medium"),
+                "count": i.get("affected_count", 0),
+                "urls": i.get("affected_urls", []),
+            }
+            for i in items
+        ]
+        for category, items in issues.items()
+    }
+    return {
+        "domain": domain,
+        "score": analysis_dict.get("score", 0),
+        "top_5_quick_wins": [
+            _rebase_win(w, issues.get(w.get("category"), []))
+            for w in cached.get("top_5_quick_wins", [])
+        ],
+        "all_findings": all_findings,
+    }
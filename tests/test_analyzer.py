@@ -20,6 +20,8 @@ from core.analyzer import (
     _detect_incorrect_canonical,
     _detect_noindex_issues,
     _calculate_score,
+    _page_url,
+    _is_live,
 )
 
 
@@ -46,6 +48,24 @@ def _make_page(**kwargs):
     return defaults
 
 
+# ─── Per-Page Accessors ─────────────────────────────────────────
+
+
+class TestPageAccessors:
+    def test_url_prefers_final_url(self):
+        page = _make_page(url="https://a.com/old", final_url="https://a.com/new")
+        assert _page_url(page) == "https://a.com/new"
+
+    def test_url_falls_back(self):
+        assert _page_url(_make_page(final_url="")) == "https://example.com/page"
+
+    def test_is_live(self):
+        assert _is_live(_make_page())
+        assert not _is_live(_make_page(status=404))
+        assert not _is_live(_make_page(error="timeout"))
+        assert not _is_live(_make_page(status=None))
+
+
 # ─── Content Issues ─────────────────────────────────────────────
 
 
@@ -68,6 +88,14 @@ class TestDuplicateTitles:
         assert issues[0].issue_type == "duplicate_titles"
         assert len(issues[0].affected_urls) == 2
 
+    def test_ignores_error_pages(self):
+        pages = [
+            _make_page(url="https://example.com/a", final_url="https://example.com/a", title="Not Found"),
+            _make_page(url="https://example.com/b", final_url="https://example.com/b", title="Not Found",
+                       status=404),
+        ]
+        assert _detect_duplicate_titles(pages) == []
+
 
 class TestMissingTitles:
     def test_all_have_titles(self):
@@ -95,6 +123,14 @@ class TestDuplicateMetas:
         assert len(issues) == 1
         assert issues[0].issue_type == "duplicate_metas"
 
+    def test_ignores_error_pages(self):
+        pages = [
+            _make_page(url="https://a.com/1", final_url="https://a.com/1", meta_description="Same meta"),
+            _make_page(url="https://a.com/2", final_url="https://a.com/2", meta_description="Same meta",
+                       status=404),
+        ]
+        assert _detect_duplicate_metas(pages) == []
+
 
 class TestMissingMetas:
     def test_finds_missing(self):
@@ -159,6 +195,19 @@ class TestBrokenHierarchy:
         pages = [_make_page(headings=[])]
         assert _detect_broken_hierarchy(pages) == []
 
+    def test_templated_pages_collapsed(self):
+        skip = [(1, "H1"), (3, "H3 without H2")]
+        pages = [
+            _make_page(url=f"https://example.com/{i}", final_url=f"https://example.com/{i}", headings=skip)
+            for i in range(3)
+        ] + [_make_page(url="https://example.com/x", final_url="https://example.com/x",
+                        headings=[(2, "H2"), (4, "H4")])]
+        issue = _detect_broken_hierarchy(pages)[0]
+        assert issue.count == 4
+        assert [d["url"] for d in issue.details["pages"]] == ["https://example.com/0", "https://example.com/x"]
+        assert issue.details["pages"][0]["similar_pages"] == 2
+        assert "similar_pages" not in issue.details["pages"][1]
+
 
 # ─── Link Issues ────────────────────────────────────────────────
 
@@ -193,6 +242,23 @@ class TestOrphanPages:
         issues = _detect_orphan_pages(pages, discovered)
         assert len(issues) == 1
         assert "https://a.com/orphan" in issues[0].affected_urls
+        assert "https://a.com/" not in issues[0].affected_urls
+
+    def test_ignores_error_pages(self):
+        pages = [
+            _make_page(url="https://a.com/", final_url="https://a.com/", internal_links=[]),
+            _make_page(url="https://a.com/gone", final_url="https://a.com/gone", status=404,
+                       internal_links=["https://a.com/only-linked-from-404"]),
+            _make_page(url="https://a.com/only-linked-from-404", final_url="https://a.com/only-linked-from-404",
+                       internal_links=[]),
+        ]
+        issues = _detect_orphan_pages(pages, ["https://a.com/"])
+        assert issues[0].affected_urls == ["https://a.com/only-linked-from-404"]
+
+    def test_no_discovered_urls(self):
+        pages = [_make_page(url="https://a.com/", final_url="https://a.com/", internal_links=[])]
+        issues = _detect_orphan_pages(pages, [])
+        assert issues[0].affected_urls == ["https://a.com/"]
 
 
 # ─── Technical Issues ───────────────────────────────────────────
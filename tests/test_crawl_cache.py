@@ -0,0 +1,112 @@
+"""Tests for the disk-persisted crawl cache (no network calls)."""
+
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, ".")
+
+import core.crawl_cache as crawl_cache
+from core.crawler import CrawlResult, PageSignals
+
+
+def _result(pages=None):
+    if pages is None:
+        pages = [PageSignals(url="https://example.com", status=200)]
+    return CrawlResult(
+        domain="example.com",
+        base_url="https://example.com",
+        discovery_method="sitemap (/sitemap.xml)",
+        urls_discovered=3,
+        urls_analyzed=3,
+        pages=pages,
+    )
+
+
+class TestCrawlCache:
+    def test_roundtrip(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        crawl_cache.save("example.com", '"etag-1"', _result())
+        cached = crawl_cache.load("example.com", '"etag-1"')
+        assert cached is not None
+        assert cached.urls_analyzed == 3
+
+    def test_token_change_misses(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        crawl_cache.save("example.com", '"etag-1"', _result())
+        assert crawl_cache.load("example.com", '"etag-2"') is None
+
+    def test_expired_entry_removed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        crawl_cache.save("example.com", "", _result())
+        assert crawl_cache.load("example.com", "", ttl=-1) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_clear(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        crawl_cache.save("example.com", "a", _result())
+        crawl_cache.save("example.org", "b", _result())
+        assert crawl_cache.clear() == 2
+        assert crawl_cache.load("example.com", "a") is None
+
+    def test_clear_missing_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path / "absent")
+        assert crawl_cache.clear() == 0
+
+    def test_save_leaves_no_temp_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        crawl_cache.save("example.com", "a", _result())
+        crawl_cache.save("example.com", "a", _result())
+        assert [p.suffix for p in tmp_path.iterdir()] == [".pkl"]
+
+    def test_save_prunes_expired_entries(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        crawl_cache.save("example.com", "old-etag", _result())
+        stale = crawl_cache._cache_path("example.com", "old-etag")
+        old = time.time() - crawl_cache.CACHE_TTL - 60
+        os.utime(stale, (old, old))
+        crawl_cache.save("example.com", "new-etag", _result())
+        assert not stale.exists()
+        assert crawl_cache.load("example.com", "new-etag") is not None
+
+
+class TestCrawlSiteCached:
+    def _patch(self, tmp_path, monkeypatch, result=None):
+        calls = []
+
+        async def fake_token(base_url, session=None):
+            return "etag"
+
+        async def fake_crawl(url_input, progress_cb=None, session=None, **kwargs):
+            calls.append(url_input)
+            return result or _result()
+
+        monkeypatch.setattr(crawl_cache, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(crawl_cache, "_freshness_token", fake_token)
+        monkeypatch.setattr(crawl_cache, "crawl_site", fake_crawl)
+        return calls
+
+    def test_second_call_served_from_cache(self, tmp_path, monkeypatch):
+        calls = self._patch(tmp_path, monkeypatch)
+        asyncio.run(crawl_cache.crawl_site_cached("example.com"))
+        asyncio.run(crawl_cache.crawl_site_cached("example.com"))
+        assert calls == ["example.com"]
+
+    def test_refresh_bypasses_cache(self, tmp_path, monkeypatch):
+        calls = self._patch(tmp_path, monkeypatch)
+        asyncio.run(crawl_cache.crawl_site_cached("example.com"))
+        asyncio.run(crawl_cache.crawl_site_cached("example.com", refresh=True))
+        assert len(calls) == 2
+        assert crawl_cache.load("example.com", "etag") is not None
+
+    def test_degraded_crawls_not_saved(self, tmp_path, monkeypatch):
+        for pages in (
+            [PageSignals(url="https://example.com", status=404)],
+            [PageSignals(url="https://example.com", status=200),
+             PageSignals(url="https://example.com/a", error="timeout")],
+        ):
+            calls = self._patch(tmp_path, monkeypatch, _result(pages))
+            asyncio.run(crawl_cache.crawl_site_cached("example.com"))
+            asyncio.run(crawl_cache.crawl_site_cached("example.com"))
+            assert len(calls) == 2
+            assert list(tmp_path.iterdir()) == []
@@ -1,9 +1,15 @@
 """Tests for crawler utilities (no network calls)."""
 
+import asyncio
 import sys
 sys.path.insert(0, ".")
 
+import aiohttp
+
+import core.crawler as crawler
 from core.crawler import (
+    _decode_html,
+    create_session,
     _parse_sitemap_xml,
     _sample_urls,
     extract_signals,
@@ -36,6 +42,15 @@ class TestParseSitemapXml:
         assert urls == []
         assert len(sitemaps) == 2
 
+    def test_bytes_honour_xml_encoding(self):
+        xml = (
+            '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            '<urlset><url><loc>https://example.com/caf\xe9</loc></url></urlset>'
+        ).encode("latin-1")
+        urls, sitemaps = _parse_sitemap_xml(xml)
+        assert urls == ["https://example.com/caf\u00e9"]
+        assert sitemaps == []
+
     def test_invalid_xml(self):
         urls, sitemaps = _parse_sitemap_xml("not xml at all")
         assert urls == []
@@ -47,6 +62,71 @@ class TestParseSitemapXml:
         assert sitemaps == []
 
 
+class TestFetchSitemapUrls:
+    def test_stops_fetching_at_max_urls(self, monkeypatch):
+        base = "https://example.com"
+        index = '<sitemapindex>' + "".join(
+            f"<sitemap><loc>{base}/child-{i}.xml</loc></sitemap>" for i in range(20)
+        ) + "</sitemapindex>"
+        fetched = []
+
+        async def fake_fetch_bytes(session, url):
+            fetched.append(url)
+            if url.endswith("/sitemap.xml"):
+                return index.encode()
+            return f"<urlset><url><loc>{url}.html</loc></url></urlset>".encode()
+
+        monkeypatch.setattr(crawler, "_fetch_bytes", fake_fetch_bytes)
+        urls = asyncio.run(crawler._fetch_sitemap_urls(
+            None, f"{base}/sitemap.xml", max_urls=3, concurrency=2
+        ))
+        assert urls == [f"{base}/child-{i}.xml.html" for i in range(3)]
+        assert len(fetched) == 5  # the index plus two batches of two
+
+
+class TestDiscoverUrls:
+    def test_sitemap_walks_share_request_limit(self, monkeypatch):
+        base = "https://example.com"
+        index = '<sitemapindex>' + "".join(
+            f"<sitemap><loc>{base}/{{name}}-{i}.xml</loc></sitemap>" for i in range(4)
+        ) + "</sitemapindex>"
+        in_flight = [0, 0]  # current, peak
+
+        async def fake_fetch_bytes(session, url):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            if url.endswith("robots.txt"):
+                return "".join(f"Sitemap: {base}/s{n}.xml\n" for n in range(3)).encode()
+            name = url.rsplit("/", 1)[1]
+            if name.count("-") == 0 and not name.endswith(".gz"):
+                return index.format(name=name[:-4]).encode()
+            return f"<urlset><url><loc>{base}/{name}</loc></url></urlset>".encode()
+
+        monkeypatch.setattr(crawler, "_fetch_bytes", fake_fetch_bytes)
+        urls, method, missing = asyncio.run(crawler._discover_urls(None, base, concurrency=2))
+        assert len(urls) == 12
+        assert method == "robots.txt (3 sitemaps)"
+        assert in_flight[1] <= 2
+
+    def test_sitemap_walks_share_url_cap(self, monkeypatch):
+        base = "https://example.com"
+
+        async def fake_fetch_bytes(session, url):
+            if url.endswith("robots.txt"):
+                return "".join(f"Sitemap: {base}/s{n}.xml\n" for n in range(3)).encode()
+            name = url.rsplit("/", 1)[1][:-4]
+            locs = "".join(f"<url><loc>{base}/{name}/{i}</loc></url>" for i in range(4))
+            shared = f"<url><loc>{base}/shared</loc></url>"
+            return f"<urlset>{shared}{locs}</urlset>".encode()
+
+        monkeypatch.setattr(crawler, "_fetch_bytes", fake_fetch_bytes)
+        urls, _, _ = asyncio.run(crawler._discover_urls(None, base, concurrency=2, max_urls=7))
+        assert len(urls) == 7
+        assert len(set(urls)) == 7
+
+
 # ─── URL Sampling ───────────────────────────────────────────────
 
 
@@ -142,6 +222,19 @@ class TestExtractSignals:
         signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
         assert len(signals.h1s) == 2
 
+    def test_headings_grouped_by_level(self):
+        html = """
+        <html><body>
+            <h2>Second</h2>
+            <h1>First</h1>
+            <h3>Third</h3>
+            <h1>  </h1>
+        </body></html>
+        """
+        signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
+        assert signals.h1s == ["First"]
+        assert signals.headings == [(1, "First"), (2, "Second"), (3, "Third")]
+
     def test_noindex_detection(self):
         html = """
         <html><head>
@@ -151,6 +244,24 @@ class TestExtractSignals:
         signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
         assert "noindex" in signals.robots_meta
 
+    def test_head_selectors_case_insensitive(self):
+        html = """
+        <html><head>
+            <link rel="Canonical" href="https://example.com/c">
+            <meta name="ROBOTS" content="NoIndex">
+            <link rel="alternate" hreflang="de" href="https://example.com/de">
+        </head><body></body></html>
+        """
+        signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
+        assert signals.canonical == "https://example.com/c"
+        assert signals.robots_meta == "noindex"
+        assert signals.has_hreflang is True
+
+    def test_alternate_without_hreflang(self):
+        html = '<html><head><link rel="alternate" href="/feed"></head></html>'
+        signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
+        assert signals.has_hreflang is False
+
     def test_schema_detection(self):
         html = """
         <html><head>
@@ -160,6 +271,18 @@ class TestExtractSignals:
         signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
         assert signals.has_schema is True
 
+    def test_word_count_skips_chrome(self):
+        html = """
+        <html><body>
+            <nav>Home About</nav>
+            <p>One two <b>three</b></p><p>four
+            five</p>
+            <script>var x = 1;</script>
+        </body></html>
+        """
+        signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
+        assert signals.word_count == 5
+
     def test_internal_links(self):
         html = """
         <html><body>
@@ -177,6 +300,23 @@ class TestExtractSignals:
         assert all(d == "example.com" for d in internal_domains)
 
 
+    def test_bytes_input_uses_meta_charset(self):
+        html = '<html><head><meta charset="iso-8859-1"><title>Caf\xe9</title></head></html>'.encode("latin-1")
+        signals = extract_signals(html, "https://example.com/", "https://example.com/", 200, "example.com")
+        assert signals.title == "Caf\u00e9"
+
+
+class TestDecodeHtml:
+    def test_http_charset(self):
+        assert _decode_html("caf\u00e9".encode("utf-8"), "utf-8") == "caf\u00e9"
+
+    def test_no_charset_returns_bytes(self):
+        assert _decode_html(b"<html></html>", None) == b"<html></html>"
+
+    def test_unknown_charset_returns_bytes(self):
+        assert _decode_html(b"<html></html>", "x-bogus") == b"<html></html>"
+
+
 class TestPageSignalsToDict:
     def test_serialization(self):
         signals = PageSignals(
@@ -193,3 +333,32 @@ class TestPageSignalsToDict:
         assert d["h1_count"] == 1
         assert d["word_count"] == 300
         assert "internal_link_count" in d
+
+
+class TestConcurrencyFromEnv:
+    def test_unset_uses_default(self, monkeypatch):
+        monkeypatch.delenv("QW_CONCURRENCY", raising=False)
+        assert crawler._concurrency_from_env() == crawler.DEFAULT_CONCURRENCY
+
+    def test_valid_value(self, monkeypatch):
+        monkeypatch.setenv("QW_CONCURRENCY", "25")
+        assert crawler._concurrency_from_env() == 25
+
+    def test_out_of_range_is_clamped(self, monkeypatch):
+        monkeypatch.setenv("QW_CONCURRENCY", "500")
+        assert crawler._concurrency_from_env() == crawler.CONCURRENCY_RANGE[1]
+        monkeypatch.setenv("QW_CONCURRENCY", "0")
+        assert crawler._concurrency_from_env() == crawler.CONCURRENCY_RANGE[0]
+
+    def test_non_integer_uses_default(self, monkeypatch):
+        monkeypatch.setenv("QW_CONCURRENCY", "fast")
+        assert crawler._concurrency_from_env() == crawler.DEFAULT_CONCURRENCY
+
+
+class TestCreateSession:
+    def test_does_not_store_cookies(self):
+        async def _jar_type():
+            async with create_session() as session:
+                return type(session.cookie_jar)
+
+        assert asyncio.run(_jar_type()) is aiohttp.DummyCookieJar
@@ -0,0 +1,57 @@
+"""Tests for the Excel action plan generator."""
+
+import sys
+sys.path.insert(0, ".")
+
+import openpyxl
+
+from core.excel_generator import action_plan_bytes, create_action_plan
+
+
+TOP_5 = [
+    {"issue": "Fix duplicate titles", "category": "content", "urls_affected": 4,
+     "what_to_do": "Rewrite them", "impact": "HIGH", "effort": None},
+]
+FINDINGS = {
+    "content": [
+        {"issue": "Duplicate titles", "severity": "high", "count": 2,
+         "urls": ["https://example.com/a", "https://example.com/b"]},
+    ],
+    "links": [],
+}
+
+
+def _load(top_5=TOP_5, findings=FINDINGS):
+    return openpyxl.load_workbook(create_action_plan(top_5, findings, "example.com"))
+
+
+class TestCreateActionPlan:
+    def test_sheets(self):
+        wb = _load()
+        assert wb.sheetnames == ["Action Plan", "Content Details"]
+
+    def test_action_plan_rows(self):
+        ws = _load()["Action Plan"]
+        assert ws["A1"].value == "Priority"
+        assert ws["A2"].value == "#1"
+        assert ws["F2"].value == "HIGH"
+        assert ws["G2"].value == "MEDIUM"
+        assert ws["A3"].value == "ALL FINDINGS"
+        assert "A3:H3" in {str(r) for r in ws.merged_cells.ranges}
+        assert ws["C4"].value == "Duplicate titles"
+        assert ws.freeze_panes == "A2"
+        assert ws.auto_filter.ref == "A1:H4"
+
+    def test_detail_sheet_lists_urls(self):
+        ws = _load()["Content Details"]
+        assert [ws["C2"].value, ws["C3"].value] == ["https://example.com/a", "https://example.com/b"]
+        assert ws.freeze_panes == "A2"
+
+    def test_empty_inputs(self):
+        wb = _load([], {})
+        assert wb.sheetnames == ["Action Plan"]
+        assert wb["Action Plan"]["A2"].value == "ALL FINDINGS"
+
+    def test_bytes_wrapper(self):
+        data = action_plan_bytes(TOP_5, FINDINGS, "example.com")
+        assert data[:2] == b"PK"  # xlsx is a zip container
@@ -0,0 +1,76 @@
+"""Tests for the LLM response cache."""
+
+import sys
+sys.path.insert(0, ".")
+
+import core.llm_cache as llm_cache
+from core.llm_cache import cache_key, get_cached, store
+
+
+class TestCacheKey:
+    def test_stable_across_key_order(self):
+        a = cache_key({"score": 80, "total_issues": 2}, {"domain": "a.com"}, "m")
+        b = cache_key({"total_issues": 2, "score": 80}, {"domain": "a.com"}, "m")
+        assert a == b
+
+    def test_model_changes_key(self):
+        a = cache_key({"score": 80}, {"domain": "a.com"}, "model-a")
+        b = cache_key({"score": 80}, {"domain": "a.com"}, "model-b")
+        assert a != b
+
+    def test_prompt_version_changes_key(self):
+        a = cache_key({"score": 80}, {"domain": "a.com"}, "m", "v1")
+        b = cache_key({"score": 80}, {"domain": "a.com"}, "m", "v2")
+        assert a != b
+
+
+class TestGetCached:
+    def test_miss(self):
+        assert get_cached({}, "missing") is None
+
+    def test_hit(self):
+        cache = {}
+        store(cache, "k", {"top_5_quick_wins": []})
+        assert get_cached(cache, "k") == {"top_5_quick_wins": []}
+
+    def test_expired_entry_evicted(self):
+        cache = {"k": (0, {"top_5_quick_wins": []})}
+        assert get_cached(cache, "k", ttl=60) is None
+        assert "k" not in cache
+
+    def test_evicts_oldest(self):
+        cache = {}
+        for i in range(3):
+            store(cache, f"k{i}", {"i": i}, max_entries=2)
+        assert list(cache) == ["k1", "k2"]
+
+
+class TestPersistentStore:
+    def test_roundtrip(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+        llm_cache.save("k", {"top_5_quick_wins": [{"issue": "x"}]})
+        assert llm_cache.load("k") == {"top_5_quick_wins": [{"issue": "x"}]}
+
+    def test_miss(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+        assert llm_cache.load("missing") is None
+
+    def test_expired_entry_removed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+        llm_cache.save("k", {"i": 1})
+        assert llm_cache.load("k", ttl=-1) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_save_leaves_no_temp_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+        llm_cache.save("k", {"i": 1})
+        llm_cache.save("k", {"i": 2})
+        assert [p.name for p in tmp_path.iterdir()] == ["k.json"]
+        assert llm_cache.load("k") == {"i": 2}
+
+    def test_clear(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+        llm_cache.save("a", {"i": 1})
+        llm_cache.save("b", {"i": 2})
+        assert llm_cache.clear() == 2
+        assert llm_cache.load("a") is None
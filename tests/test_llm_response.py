@@ -0,0 +1,66 @@
+"""Tests for LLM response parsing (no API calls)."""
+
+import sys
+sys.path.insert(0, ".")
+
+from core.llm_response import chunk_text, parse_json_response
+
+
+VALID = '{"top_5_quick_wins": [{"rank": 1, "issue": "Fix titles"}], "all_findings": {}}'
+
+
+class TestParseJsonResponse:
+    def test_plain_json(self):
+        assert parse_json_response(VALID)["top_5_quick_wins"][0]["rank"] == 1
+
+    def test_fenced_json(self):
+        assert parse_json_response(f"```json\n{VALID}\n```") is not None
+
+    def test_prose_around_json(self):
+        result = parse_json_response(f"Here is the plan:\n{VALID}\nHope this helps!")
+        assert result["all_findings"] == {}
+
+    def test_braces_inside_strings(self):
+        raw = 'Sure: {"top_5_quick_wins": [{"issue": "Fix } in titles"}], "all_findings": {}}'
+        assert parse_json_response(raw)["top_5_quick_wins"][0]["issue"] == "Fix } in titles"
+
+    def test_truncated_response_rejected(self):
+        raw = '```json\n{"top_5_quick_wins": [{"rank": 1, "issue": "Fix titles", "impact": "high"}, {"rank": 2'
+        assert parse_json_response(raw) is None
+
+    def test_nested_object_not_accepted(self):
+        raw = 'Oops {"top_5_quick_wins": [ {"rank": 1, "issue": "Fix titles"} trailing'
+        assert parse_json_response(raw) is None
+
+    def test_missing_top_5_rejected(self):
+        assert parse_json_response('{"rank": 1, "issue": "Fix titles"}') is None
+
+    def test_missing_all_findings_defaults_to_empty(self):
+        result = parse_json_response('{"top_5_quick_wins": [{"rank": 1}]}')
+        assert result == {"top_5_quick_wins": [{"rank": 1}], "all_findings": {}}
+
+    def test_empty(self):
+        assert parse_json_response("") is None
+        assert parse_json_response("no json here") is None
+
+
+class _Chunk:
+    def __init__(self, text=None, error=None):
+        self._text, self._error = text, error
+
+    @property
+    def text(self):
+        if self._error:
+            raise self._error
+        return self._text
+
+
+class TestChunkText:
+    def test_text_chunk(self):
+        assert chunk_text(_Chunk("{\"top")) == "{\"top"
+
+    def test_chunk_without_text_parts(self):
+        assert chunk_text(_Chunk(error=ValueError("no parts"))) == ""
+
+    def test_none_text(self):
+        assert chunk_text(_Chunk(None)) == ""
@@ -0,0 +1,119 @@
+"""Tests for the similarity-based LLM cache."""
+
+import sys
+sys.path.insert(0, ".")
+
+from core.semantic_cache import findings_vector, cosine_similarity, counts_close, lookup, add, rebase
+
+
+def _analysis(**counts):
+    return {
+        "content_issues": [
+            {"issue_type": t, "affected_count": c} for t, c in counts.items()
+        ],
+    }
+
+
+class TestFindingsVector:
+    def test_counts_by_type(self):
+        vec = findings_vector(_analysis(duplicate_titles=12, missing_metas=3))
+        assert vec == {"duplicate_titles": 12.0, "missing_metas": 3.0}
+
+    def test_sitemap_flag(self):
+        vec = findings_vector({"sitemap_missing": True})
+        assert vec == {"sitemap_missing": 1.0}
+
+
+class TestCosineSimilarity:
+    def test_identical(self):
+        assert cosine_similarity({"a": 2.0}, {"a": 2.0}) == 1.0
+
+    def test_disjoint(self):
+        assert cosine_similarity({"a": 1.0}, {"b": 1.0}) == 0.0
+
+    def test_both_empty(self):
+        assert cosine_similarity({}, {}) == 1.0
+
+
+class TestLookup:
+    def test_near_duplicate_hits(self):
+        entries = []
+        add(entries, "a.com", findings_vector(_analysis(duplicate_titles=40, missing_metas=10)), {"r": 1})
+        vec = findings_vector(_analysis(duplicate_titles=41, missing_metas=10))
+        assert lookup(entries, "a.com", vec) == {"r": 1}
+
+    def test_other_domain_misses(self):
+        entries = []
+        add(entries, "a.com", {"x": 1.0}, {"r": 1})
+        assert lookup(entries, "b.com", {"x": 1.0}) is None
+
+    def test_dissimilar_misses(self):
+        entries = []
+        add(entries, "a.com", {"x": 1.0}, {"r": 1})
+        assert lookup(entries, "a.com", {"y": 1.0}) is None
+
+    def test_scaled_counts_miss(self):
+        entries = []
+        add(entries, "a.com", findings_vector(_analysis(duplicate_titles=10, missing_metas=4)), {"r": 1})
+        vec = findings_vector(_analysis(duplicate_titles=30, missing_metas=12))
+        assert cosine_similarity(vec, entries[0][1]) > 0.999
+        assert lookup(entries, "a.com", vec) is None
+
+    def test_new_issue_type_misses(self):
+        entries = []
+        add(entries, "a.com", findings_vector(_analysis(duplicate_titles=40, missing_metas=10)), {"r": 1})
+        vec = findings_vector(_analysis(duplicate_titles=40, missing_metas=10, noindex_pages=2))
+        assert lookup(entries, "a.com", vec) is None
+
+
+class TestCountsClose:
+    def test_small_drift(self):
+        assert counts_close({"a": 40.0}, {"a": 43.0})
+        assert counts_close({"a": 1.0}, {"a": 2.0})
+
+    def test_large_drift(self):
+        assert not counts_close({"a": 40.0}, {"a": 50.0})
+
+    def test_different_types(self):
+        assert not counts_close({"a": 1.0}, {"a": 1.0, "b": 1.0})
+
+
+class TestRebase:
+    CACHED = {
+        "domain": "a.com",
+        "score": 90,
+        "top_5_quick_wins": [{
+            "rank": 1,
+            "issue": "Fix 40 duplicate title tags",
+            "category": "content",
+            "urls_affected": 40,
+            "example_urls": ["https://a.com/1"],
+            "what_to_do": "Rewrite them",
+        }],
+        "all_findings": {"content": [{"issue": "stale", "count": 40}]},
+    }
+
+    def _current(self):
+        return {
+            "score": 71,
+            "content_issues": [
+                {"title": "Fix 42 pages with duplicate titles", "issue_type": "duplicate_titles",
+                 "severity": "high", "affected_count": 42,
+                 "affected_urls": ["https://a.com/1", "https://a.com/2"]},
+                {"title": "Add meta descriptions", "issue_type": "missing_metas",
+                 "severity": "medium", "affected_count": 3, "affected_urls": ["https://a.com/9"]},
+            ],
+        }
+
+    def test_score_and_findings_from_current_analysis(self):
+        result = rebase(self.CACHED, self._current(), "a.com")
+        assert result["score"] == 71
+        assert [f["count"] for f in result["all_findings"]["content"]] == [42, 3]
+        assert result["all_findings"]["headings"] == []
+
+    def test_win_wording_kept_counts_refreshed(self):
+        win = rebase(self.CACHED, self._current(), "a.com")["top_5_quick_wins"][0]
+        assert win["what_to_do"] == "Rewrite them"
+        assert win["issue"] == "Fix 40 duplicate title tags"
+        assert win["urls_affected"] == 42
+        assert win["example_urls"] == ["https://a.com/1", "https://a.com/2"]
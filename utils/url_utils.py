@@ -1,6 +1,7 @@
 """URL normalization, validation, and filtering utilities."""
 
-from urllib.parse import urlparse, urljoin
+import functools
+from urllib.parse import urlparse, urlsplit, urljoin
 
 IMAGE_EXTENSIONS = frozenset({
     ".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg", ".ico",
@@ -15,14 +16,15 @@ SKIP_EXTENSIONS = IMAGE_EXTENSIONS | frozenset({
 })
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_domain(url_or_domain: str) -> str:
-    """Extract and normalize domain: lowercase, no www, no port."""
+    """Extract and normalize domain: lowercase, no www, no port (memoized; called per link)."""
     s = (url_or_domain or "").strip()
     if not s:
         return ""
     s_lower = s.lower()
     if s_lower.startswith(("http://", "https://")):
-        s = urlparse(s).netloc
+        s = urlsplit(s).netloc
     s = s.lower()
     if s.startswith("www."):
         s = s[4:]